@@ -0,0 +1,73 @@
+"""Exercise DetectionClient against the local stub with latency and injected failures.
+
+Runs the same batch of detections sequentially through the blocking path and
+concurrently through the async path, then reports wall time, retries and the
+peak number of requests the stub saw in flight.
+
+    python benchmarks/bench_detection_client.py --documents 40 --max-in-flight 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_redactor.detection_client import DetectionClient  # noqa: E402
+from resume_redactor.redactor import PDFRedactor  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+
+
+def texts(count: int) -> list:
+    return [f"Jane Q. Doe resume number {i} Acme Inc. 2015-2020" for i in range(count)]
+
+
+def run_sync(client: DetectionClient, docs: list) -> int:
+    ok = 0
+    for text in docs:
+        redactor = PDFRedactor("stub", client=client)
+        redactor.detect_resume_info(text)
+        ok += redactor.last_error is None
+    return ok
+
+
+async def run_async(client: DetectionClient, docs: list) -> int:
+    async def one(text: str) -> bool:
+        redactor = PDFRedactor("stub", client=client)
+        await redactor.detect_resume_info_async(text)
+        return redactor.last_error is None
+
+    results = await asyncio.gather(*(one(text) for text in docs))
+    return sum(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=40)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--tokens-per-minute", type=float, default=None)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    docs = texts(args.documents)
+    for label, runner in (("sync ", lambda c: run_sync(c, docs)),
+                          ("async", lambda c: asyncio.run(run_async(c, docs)))):
+        server, url = start_stub_server(latency=args.latency, error_rate=args.error_rate,
+                                        rate_limit_rate=args.rate_limit_rate, seed=1)
+        client = DetectionClient("stub", url, max_in_flight=args.max_in_flight,
+                                 tokens_per_minute=args.tokens_per_minute, backoff_base=0.05)
+        start = time.perf_counter()
+        ok = runner(client)
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        client.close()
+        print(f"{label}: {ok}/{len(docs)} ok in {elapsed:6.2f}s  "
+              f"client={client.stats}  stub_max_in_flight={server.stats['max_in_flight']}")
+
+
+if __name__ == "__main__":
+    main()
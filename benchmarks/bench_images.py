@@ -0,0 +1,94 @@
+"""Compare eager PNG encoding of every image with the metadata-only inventory.
+
+Builds a portfolio-style PDF whose large images are reused across pages, then
+reports time and peak traced memory for the old ``find_images`` approach (a
+Pixmap and PNG per placement) and for ``ImageInventory``, plus the cost of
+the first and a cached thumbnail.
+
+    python benchmarks/bench_images.py --pages 10 --images 6 --size 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_redactor.session import RedactionSession  # noqa: E402
+
+
+def build_pdf(pages: int, images: int, size: int, seed: int = 5) -> bytes:
+    rng = random.Random(seed)
+    doc = fitz.open()
+    xrefs = []
+    for n in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 50), f"Portfolio page {n + 1}", fontsize=14)
+        for i in range(images):
+            rect = fitz.Rect(50 + (i % 3) * 170, 80 + (i // 3) * 170, 200 + (i % 3) * 170, 230 + (i // 3) * 170)
+            if len(xrefs) < images:
+                pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, size, size), False)
+                pix.clear_with(rng.randrange(256))
+                xrefs.append(page.insert_image(rect, pixmap=pix))
+            else:
+                page.insert_image(rect, xref=xrefs[(i + n) % len(xrefs)])
+    data = doc.write(deflate=True)
+    doc.close()
+    return data
+
+
+def eager_png(pdf_bytes: bytes):
+    # what find_images used to do: decode and PNG-encode every placement
+    images = []
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    for page in doc:
+        for img in page.get_images(full=True):
+            pix = fitz.Pixmap(doc, img[0])
+            if pix.n - pix.alpha < 4:
+                images.append({"xref": img[0], "bbox": page.get_image_bbox(img), "data": pix.tobytes("png")})
+    doc.close()
+    return images
+
+
+def inventory(pdf_bytes: bytes):
+    with RedactionSession(pdf_bytes) as session:
+        return session.images.images()
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--images", type=int, default=6, help="distinct images, each drawn on every page")
+    parser.add_argument("--size", type=int, default=2000, help="image side in pixels")
+    args = parser.parse_args()
+
+    pdf_bytes = build_pdf(args.pages, args.images, args.size)
+    print(f"{len(pdf_bytes) / 1e6:.1f} MB PDF, {args.pages} pages x {args.images} placements")
+    for label, fn in (("eager png", lambda: eager_png(pdf_bytes)), ("inventory", lambda: inventory(pdf_bytes))):
+        elapsed, peak, result = measure(fn)
+        print(f"{label:10s} {elapsed * 1000:9.1f} ms  peak {peak / 1e6:7.1f} MB  {len(result)} entries")
+
+    with RedactionSession(pdf_bytes) as session:
+        xref = session.images.images()[0].xref
+        for label in ("thumbnail (cold)", "thumbnail (lru)"):
+            start = time.perf_counter()
+            data = session.thumbnail(xref)
+            print(f"{label:17s} {(time.perf_counter() - start) * 1000:8.2f} ms  {len(data)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Check that the large-file mode redacts a big scan within its memory budget.
+
+Writes a scan-like PDF (one incompressible image plus a text layer per page)
+to a temporary file, then redacts it in a fresh process per mode:
+
+* ``bytes``: the default path, reading the file into memory and returning
+  the output as bytes;
+* ``path``: the default path on a session opened from the file;
+* ``windowed``: the large-file mode (``--memory-budget``), streaming the
+  output to a file.
+
+For each mode it reports the wall time, the peak of Python allocations
+(``tracemalloc``) and the peak resident memory growth after imports, which
+also covers MuPDF's own allocations. The exit status is 1 if the windowed
+run exceeds the budget or its Python peak reaches a tenth of the file size,
+i.e. if it copied the document into Python memory. It is also 1 if a
+windowed run with a budget of one byte does not fail with
+``MemoryBudgetExceeded``.
+
+    python benchmarks/bench_large_file.py --pages 60 --image-side 1400 --budget 150
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_redactor.large_file import MemoryBudgetExceeded, resident_bytes  # noqa: E402
+from resume_redactor.plan import RedactionPlan  # noqa: E402
+from resume_redactor.redactor import PDFRedactor  # noqa: E402
+from resume_redactor.session import RedactionSession  # noqa: E402
+
+TERMS = ["Jane Sharma", "jane.sharma@example.com", "+1 415 555 0134", "Acme Robotics"]
+MODES = ("bytes", "path", "windowed")
+
+
+def build_scan(path: str, pages: int, side: int, seed: int = 3) -> None:
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        samples = rng.randbytes(side * side)
+        pix = fitz.Pixmap(fitz.csGRAY, side, side, samples, False)
+        page.insert_image(fitz.Rect(36, 120, 576, 756), pixmap=pix)
+        page.insert_text((36, 60), f"Page {n + 1} of the application of {TERMS[0]}", fontsize=11)
+        page.insert_text((36, 80), f"{TERMS[1]} | {TERMS[2]} | {TERMS[3]}", fontsize=11)
+    doc.save(path)
+    doc.close()
+
+
+def peak_resident() -> int:
+    # VmHWM starts afresh at exec; ru_maxrss carries over the parent's peak
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run(mode: str, path: str, budget: int) -> dict:
+    plan = RedactionPlan.from_terms(TERMS)
+    out_path = path + f".{mode}.out.pdf"
+    baseline = resident_bytes()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = {"mode": mode, "error": None}
+    try:
+        if mode == "bytes":
+            with open(path, "rb") as fh:
+                data = PDFRedactor.apply_plan(fh.read(), plan, redact_images=True)
+            with open(out_path, "wb") as fh:
+                fh.write(data)
+        elif mode == "path":
+            data = PDFRedactor.apply_plan(path, plan, redact_images=True)
+            with open(out_path, "wb") as fh:
+                fh.write(data)
+        else:
+            with RedactionSession(path) as session:
+                PDFRedactor.apply_plan(session, plan, redact_images=True, output=out_path, memory_budget=budget)
+    except MemoryBudgetExceeded as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    result["python_peak"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result["resident_peak"] = peak_resident() - (baseline or 0)
+    if os.path.exists(out_path):
+        result["bytes_out"] = os.path.getsize(out_path)
+        os.remove(out_path)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--image-side", type=int, default=1200, help="pixels per side of each page's scan")
+    parser.add_argument("--budget", type=float, default=150, help="memory budget in MB")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    budget = int(args.budget * 1e6)
+
+    if args.run:
+        print(json.dumps(run(args.run, args.input, budget)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scan.pdf")
+        build_scan(path, args.pages, args.image_side)
+        size = os.path.getsize(path)
+        print(f"{size / 1e6:.0f} MB scan, {args.pages} pages, budget {args.budget:.0f} MB")
+        failed = False
+        for mode in args.modes.split(","):
+            proc = subprocess.run([sys.executable, __file__, "--run", mode, "--input", path,
+                                   "--budget", str(args.budget)], capture_output=True, text=True)
+            if proc.returncode:
+                print(f"{mode:9s} failed: {proc.stderr.strip().splitlines()[-1:]}")
+                failed = True
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{mode:9s} {result['seconds']:7.2f} s  python peak {result['python_peak'] / 1e6:7.1f} MB  "
+                  f"resident peak +{result['resident_peak'] / 1e6:7.1f} MB"
+                  + (f"  ERROR {result['error']}" if result["error"] else ""))
+            if mode == "windowed":
+                failed |= bool(result["error"]) or result["resident_peak"] > budget \
+                    or result["python_peak"] >= size / 10
+        if resident_bytes() is not None:
+            # a budget nothing fits in must fail the document, not the process
+            proc = subprocess.run([sys.executable, __file__, "--run", "windowed", "--input", path,
+                                   "--budget", "1e-6"], capture_output=True, text=True)
+            error = json.loads(proc.stdout.strip().splitlines()[-1])["error"] if proc.returncode == 0 else None
+            print(f"{'exceeded':9s} {'MemoryBudgetExceeded: ' + error if error else 'not raised'}")
+            failed |= error is None
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
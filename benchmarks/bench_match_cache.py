@@ -0,0 +1,112 @@
+"""Replay an iterative review session with and without the per-page match cache.
+
+Builds a synthetic resume (see ``synthetic.py``) and simulates a reviewer
+ticking and unticking detected items one click at a time, redacting after
+every click. Each click is redacted from scratch and again through a
+``MatchCache`` shared across the session; the script reports the time per
+click for both, how many pages the cache rebuilt, and checks that both
+outputs render identically and keep the same outline and links:
+
+    python benchmarks/bench_match_cache.py --pages 12 --clicks 20 --density 0.03
+
+``--references`` gives the document an outline entry per page and a link
+from the first page to the last, which the cache must not break.
+The exit status is 1 if any click's outputs differ.
+"""
+import argparse
+import hashlib
+import os
+import random
+import statistics
+import sys
+import time
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_redactor.match_cache import MatchCache  # noqa: E402
+from resume_redactor.redactor import PDFRedactor  # noqa: E402
+from resume_redactor.session import RedactionSession  # noqa: E402
+from synthetic import build_resume  # noqa: E402
+
+
+def fingerprint(pdf_bytes: bytes, dpi: int = 36) -> list:
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [hashlib.sha1(page.get_pixmap(dpi=dpi).samples).hexdigest() for page in doc]
+
+
+def references(pdf_bytes: bytes) -> tuple:
+    """The outline and each page's internal link targets."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        links = [[(link["kind"], link.get("page")) for link in page.get_links()] for page in doc]
+        return doc.get_toc(), links
+
+
+def add_references(pdf_bytes: bytes) -> bytes:
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        doc.set_toc([[1, f"Page {n + 1}", n + 1] for n in range(doc.page_count)])
+        doc[0].insert_link({"kind": fitz.LINK_GOTO, "from": fitz.Rect(10, 10, 60, 30),
+                            "page": doc.page_count - 1})
+        return doc.write()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--clicks", type=int, default=20)
+    parser.add_argument("--density", type=float, default=0.03)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--references", action="store_true", help="add an outline and an internal link")
+    parser.add_argument("--no-verify", action="store_true", help="skip the rendered comparison")
+    args = parser.parse_args()
+
+    pdf_bytes, truth = build_resume(pages=args.pages, density=args.density, seed=args.seed)
+    if args.references:
+        pdf_bytes = add_references(pdf_bytes)
+    # the name is in every page's header, so toggling it would touch every page
+    items = [(section, item) for section, fields in truth.model_dump().items()
+             for field, values in fields.items() if field != "names" for item in values]
+    rng = random.Random(args.seed)
+    cache = MatchCache()
+    selected = []
+    plain_ms, cached_ms, rebuilt = [], [], []
+    mismatches = 0
+    with RedactionSession(pdf_bytes) as session:
+        for click in range(args.clicks):
+            if selected and rng.random() < 0.3:
+                selected.remove(rng.choice(selected))
+            else:
+                selected.append(rng.choice([item for item in items if item not in selected] or items))
+            selection = {}
+            for section, item in selected:
+                selection.setdefault(section, []).append(item)
+
+            start = time.perf_counter()
+            plain = PDFRedactor.redact_pdf_section_wise(session, truth, {}, True, selection)
+            plain_ms.append((time.perf_counter() - start) * 1000)
+            before = cache.stats["pages_rebuilt"]
+            start = time.perf_counter()
+            cached = PDFRedactor.redact_pdf_section_wise(session, truth, {}, True, selection, match_cache=cache)
+            cached_ms.append((time.perf_counter() - start) * 1000)
+            rebuilt.append(cache.stats["pages_rebuilt"] - before)
+            if references(plain) != references(cached):
+                print(f"click {click}: outline or links differ")
+                mismatches += 1
+            elif not args.no_verify and fingerprint(plain) != fingerprint(cached):
+                print(f"click {click}: outputs differ")
+                mismatches += 1
+
+    print(f"{args.pages} pages, {args.clicks} clicks, {len(items)} items")
+    print(f"from scratch     mean {statistics.mean(plain_ms):7.1f} ms  median {statistics.median(plain_ms):7.1f} ms")
+    print(f"match cache      mean {statistics.mean(cached_ms[1:] or cached_ms):7.1f} ms  "
+          f"median {statistics.median(cached_ms[1:] or cached_ms):7.1f} ms  (after the first click)")
+    print(f"pages rebuilt    mean {statistics.mean(rebuilt[1:] or rebuilt):7.1f} of {args.pages}  "
+          f"term lookups {cache.stats['term_hits']} cached / {cache.stats['term_misses']} searched")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""Compare the per-term ``page.search_for`` loop with the single-pass TermMatcher.
+
+Run from the repository root:
+
+    python benchmarks/bench_matching.py --pages 5 --terms 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_redactor.matching import TermMatcher  # noqa: E402
+
+WORDS = [
+    "engineer", "designed", "platform", "scalable", "pipeline", "python", "delivered",
+    "customers", "latency", "reduced", "migrated", "services", "team", "led", "built",
+    "analytics", "dashboard", "cloud", "infrastructure", "automation", "testing",
+]
+COMPANIES = ["Acme Inc.", "Globex Corp.", "Initech LLC", "Umbrella Ltd.", "Hooli", "Stark Industries"]
+
+
+def build_pdf(pages: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        y = 60
+        page.insert_text((50, y), "Jane Q. Doe  jane.doe@example.com  (555) 123-4567", fontsize=12)
+        y += 20
+        while y < page.rect.height - 60:
+            words = rng.choices(WORDS, k=10)
+            words.insert(rng.randrange(len(words)), rng.choice(COMPANIES))
+            page.insert_text((50, y), " ".join(words), fontsize=10)
+            y += 14
+    data = doc.write()
+    doc.close()
+    return data
+
+
+def build_terms(count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    base = ["Jane Q. Doe", "jane.doe@example.com", "(555) 123-4567", "5551234567"] + COMPANIES
+    terms = []
+    for item in base:
+        terms.extend([item, item.lower(), item.upper(), item.title()])
+    while len(terms) < count:
+        terms.append(" ".join(rng.choices(WORDS, k=rng.randint(1, 3))))
+    return terms[:count]
+
+
+def search_loop(doc, terms) -> list:
+    hits = []
+    for page in doc:
+        for term in terms:
+            hits.extend(page.search_for(term))
+    return hits
+
+
+def matcher_pass(doc, terms) -> list:
+    matcher = TermMatcher(terms)
+    hits = []
+    for page in doc:
+        hits.extend(rect for _, rect in matcher.search_page(page))
+    return hits
+
+
+def coverage(rects) -> set:
+    return {tuple(round(v) for v in r) for r in rects}
+
+
+def timed(fn, doc, terms, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(doc, terms)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--terms", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    doc = fitz.open(stream=build_pdf(args.pages), filetype="pdf")
+    terms = build_terms(args.terms)
+
+    loop_time, loop_hits = timed(search_loop, doc, terms, args.repeat)
+    matcher_time, matcher_hits = timed(matcher_pass, doc, terms, args.repeat)
+    doc.close()
+
+    missing = coverage(loop_hits) - coverage(matcher_hits)
+    print(f"pages={args.pages} terms={len(terms)}")
+    print(f"search_for loop : {loop_time * 1000:9.1f} ms  ({len(loop_hits)} hits)")
+    print(f"TermMatcher     : {matcher_time * 1000:9.1f} ms  ({len(matcher_hits)} hits)")
+    print(f"speedup         : {loop_time / matcher_time:9.1f}x")
+    print(f"rects missed    : {len(missing)}")
+
+
+if __name__ == "__main__":
+    main()
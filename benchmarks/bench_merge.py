@@ -0,0 +1,80 @@
+"""Compare the original pairwise rect merge with the sweep-line merger.
+
+Generates dense text-line hit rectangles (many overlapping name/company
+variants per line) and reports time, output box count and how many output
+boxes still overlap each other.
+
+    python benchmarks/bench_merge.py --lines 60 --hits-per-line 40
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_redactor.geometry import merge_rects  # noqa: E402
+
+
+def pairwise_merge(rects):
+    # the merge used before the sweep line: first intersecting box only, one pass
+    merged = []
+    for rect in rects:
+        for i, existing in enumerate(merged):
+            if rect.intersects(existing):
+                merged[i] = rect | existing
+                break
+        else:
+            merged.append(rect)
+    return merged
+
+
+def dense_hits(lines: int, per_line: int, seed: int = 3):
+    rng = random.Random(seed)
+    rects = []
+    for line in range(lines):
+        y0 = 40 + line * 12
+        for _ in range(per_line):
+            x0 = rng.uniform(40, 520)
+            rects.append(fitz.Rect(x0, y0, x0 + rng.uniform(15, 70), y0 + 11) + (-0.5, -0.5, 0.5, 0.5))
+    return rects
+
+
+def overlapping_pairs(rects) -> int:
+    boxes = [tuple(r) for r in rects]
+    return sum(1 for a, b in itertools.combinations(boxes, 2)
+               if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3])
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=60)
+    parser.add_argument("--hits-per-line", type=int, default=40)
+    parser.add_argument("--coalesce-gap", type=float, default=1.5)
+    args = parser.parse_args()
+
+    rects = dense_hits(args.lines, args.hits_per_line)
+    rows = [
+        ("pairwise", lambda: pairwise_merge(list(rects))),
+        ("sweep", lambda: merge_rects(rects)),
+        (f"sweep+gap {args.coalesce_gap}", lambda: merge_rects(rects, args.coalesce_gap)),
+    ]
+    print(f"{len(rects)} input rects")
+    for label, fn in rows:
+        elapsed, merged = timed(fn)
+        print(f"{label:16s} {elapsed * 1000:9.2f} ms  {len(merged):5d} boxes  "
+              f"{overlapping_pairs(merged):4d} overlapping pairs left")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare output profiles on redacted synthetic resumes.
+
+Redacts a generated resume (see ``synthetic.py``) once per profile and
+reports the write time, output size and the reduction against the input
+and against the ``fast`` profile:
+
+    python benchmarks/bench_output.py --pages 1,8 --image-size 1200
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_redactor.metrics import collect  # noqa: E402
+from resume_redactor.output import OUTPUT_PROFILES  # noqa: E402
+from resume_redactor.redactor import PDFRedactor  # noqa: E402
+from synthetic import build_resume  # noqa: E402
+
+SECTIONS = ["personal_info", "education", "experience"]
+
+
+def run(pdf_bytes: bytes, truth, profile: str, repeat: int, redact_images: bool):
+    selected = PDFRedactor.select_items(truth, SECTIONS)
+    times, size = [], 0
+    for _ in range(repeat):
+        with collect() as events:
+            sink = io.BytesIO()
+            start = time.perf_counter()
+            size = PDFRedactor.redact_pdf_section_wise(pdf_bytes, truth, dict.fromkeys(SECTIONS, True),
+                                                       redact_images, selected, output=sink, profile=profile)
+            total = time.perf_counter() - start
+        write = next(e for e in events if e["stage"] == "write")
+        times.append((write["seconds"], total))
+    return size, statistics.median(t[0] for t in times), statistics.median(t[1] for t in times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", default="1,8", help="comma-separated page counts")
+    parser.add_argument("--images", type=int, default=1, help="images per page")
+    parser.add_argument("--image-size", type=int, default=1200)
+    parser.add_argument("--redact-images", action="store_true",
+                        help="black out the images too (leaves little for downsampling)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for pages in [int(p) for p in args.pages.split(",")]:
+        pdf_bytes, truth = build_resume(pages=pages, images=args.images, image_size=args.image_size)
+        print(f"pages={pages}: input {len(pdf_bytes) / 1e3:.0f} kB")
+        fast = None
+        for profile in OUTPUT_PROFILES:
+            size, write, total = run(pdf_bytes, truth, profile, args.repeat, args.redact_images)
+            fast = fast or size
+            print(f"  {profile:10s} {size / 1e3:9.0f} kB  {1 - size / len(pdf_bytes):+7.1%} vs input  "
+                  f"{1 - size / fast:+7.1%} vs fast  write {write * 1000:7.1f} ms  total {total * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compare page-parallel redaction with the serial path, and time it per worker count.
+
+Builds synthetic resumes (see ``synthetic.py``) of each ``--pages`` count
+and redacts them serially and across each ``--workers`` count. The parallel
+runs go through ``redact_parallel`` directly, below ``PARALLEL_MIN_PAGES``
+as well, so the table shows where splitting starts to pay off. Every
+parallel output is checked against the serial one page by page: text,
+redaction boxes, rendering, links and outline.
+
+    python benchmarks/bench_parallel.py --pages 8,24,48,96 --workers 2,4 --repeat 3
+
+``--references`` gives each document an outline and internal links; those
+documents go through ``apply_plan``, which keeps them serial (see
+``parallel.has_references``), and must come back with the links intact.
+Scaling needs as many free cores as workers; the CPU count is printed with
+the results. The exit status is 1 if any output differs from the serial one.
+"""
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import time
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_redactor.parallel import PARALLEL_MIN_PAGES, has_references, redact_parallel  # noqa: E402
+from resume_redactor.plan import RedactionPlan  # noqa: E402
+from resume_redactor.redactor import COALESCE_GAP, PDFRedactor  # noqa: E402
+from resume_redactor.session import RedactionSession  # noqa: E402
+from synthetic import build_resume  # noqa: E402
+
+SECTIONS = dict.fromkeys(("personal_info", "education", "experience"), True)
+
+
+def add_references(pdf_bytes: bytes) -> bytes:
+    """An outline entry per page and a link from every page to the one half the document away."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        count = doc.page_count
+        doc.set_toc([[1, f"Page {n + 1}", n + 1] for n in range(count)])
+        for n, page in enumerate(doc):
+            page.insert_link({"kind": fitz.LINK_GOTO, "from": fitz.Rect(10, 10, 60, 30),
+                              "page": (n + count // 2) % count})
+        return doc.write()
+
+
+def describe(pdf_bytes: bytes, dpi: int = 36) -> dict:
+    """What must not differ between serial and parallel output, per page and for the document."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return {
+            "text": [page.get_text() for page in doc],
+            "boxes": [sorted(tuple(round(v, 1) for v in drawing["rect"]) for drawing in page.get_drawings()
+                             if drawing.get("fill") is not None) for page in doc],
+            "render": [hashlib.sha1(page.get_pixmap(dpi=dpi).samples).hexdigest() for page in doc],
+            "links": [[(link["kind"], link.get("page")) for link in page.get_links()] for page in doc],
+            "outline": doc.get_toc(),
+        }
+
+
+def redact(pdf_bytes: bytes, plan: RedactionPlan, workers: int) -> bytes:
+    if workers == 1:
+        return PDFRedactor.apply_plan(pdf_bytes, plan, redact_images=True)
+    with RedactionSession(pdf_bytes) as session:
+        if has_references(session.doc):
+            return PDFRedactor.apply_plan(session, plan, redact_images=True, workers=workers)
+        stats = {"pages": 0, "terms": len(plan), "text_redactions": 0, "image_redactions": 0}
+        return redact_parallel(session, plan, True, stats, COALESCE_GAP, workers)
+
+
+def timed(pdf_bytes: bytes, plan: RedactionPlan, workers: int, repeat: int):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = redact(pdf_bytes, plan, workers)
+        seconds.append(time.perf_counter() - start)
+    return data, statistics.median(seconds)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", default="8,24,48", help="comma-separated page counts")
+    parser.add_argument("--workers", default="2,4", help="comma-separated worker counts")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the median is reported")
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--images", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=4)
+    parser.add_argument("--references", action="store_true", help="add an outline and internal links")
+    args = parser.parse_args()
+    worker_counts = [int(n) for n in args.workers.split(",")]
+
+    print(f"{os.cpu_count()} CPUs, PARALLEL_MIN_PAGES={PARALLEL_MIN_PAGES}, median of {args.repeat}")
+    mismatches = 0
+    break_even = {}
+    for pages in (int(n) for n in args.pages.split(",")):
+        pdf_bytes, truth = build_resume(pages=pages, density=args.density, images=args.images, seed=args.seed)
+        if args.references:
+            pdf_bytes = add_references(pdf_bytes)
+        plan = RedactionPlan.compile(truth, SECTIONS)
+        serial, serial_seconds = timed(pdf_bytes, plan, 1, args.repeat)
+        expected = describe(serial)
+        print(f"{pages:4d} pages  serial     {serial_seconds:7.2f} s")
+        for workers in worker_counts:
+            data, seconds = timed(pdf_bytes, plan, workers, args.repeat)
+            differs = [key for key, value in describe(data).items() if value != expected[key]]
+            mismatches += bool(differs)
+            if seconds < serial_seconds and workers not in break_even:
+                break_even[workers] = pages
+            print(f"{pages:4d} pages  {workers:2d} workers {seconds:7.2f} s  x{serial_seconds / seconds:4.2f}"
+                  + (f"  DIFFERS: {', '.join(differs)}" if differs else ""))
+    for workers in worker_counts:
+        shown = f"{break_even[workers]} pages" if workers in break_even else "never"
+        print(f"{workers} workers first beat serial at {shown}")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
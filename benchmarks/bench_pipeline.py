@@ -0,0 +1,235 @@
+"""Time every pipeline stage and the whole pipeline on synthetic resumes.
+
+Each configuration is a generated resume (see ``synthetic.py``). Stages run
+separately (parse, extract_text, detect, smart search terms, the matching
+loop, rect merging, find_images, doc.write) and then end to end as the app
+runs them. Detection goes to the local stub answering with the generator's
+ground truth. Results are written as JSON and can be checked against an
+earlier run:
+
+    python benchmarks/bench_pipeline.py --pages 1,4,16 --output base.json
+    git checkout my-branch
+    python benchmarks/bench_pipeline.py --pages 1,4,16 --compare base.json
+
+With ``--compare``, any stage whose median time or peak traced memory grew
+by more than ``--tolerance`` is listed and the exit status is 1. Peak memory
+is what ``tracemalloc`` sees, i.e. Python allocations; MuPDF's own buffers
+only show up in the process-wide ``max_rss_mb``.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_redactor.detection_client import DetectionClient  # noqa: E402
+from resume_redactor.matching import TermMatcher  # noqa: E402
+from resume_redactor.redactor import COALESCE_GAP, PDFRedactor  # noqa: E402
+from resume_redactor.session import RedactionSession  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+from synthetic import FONTS, build_resume  # noqa: E402
+
+SECTIONS = ["personal_info", "education", "experience"]
+
+
+def measure(fn: Callable[[Any], Any], setup: Callable[[], Any] = lambda: None,
+            teardown: Callable[[Any], None] = lambda arg: None, repeat: int = 5) -> Dict[str, float]:
+    """Median/min wall time over ``repeat`` runs plus the peak of one traced run."""
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - start)
+        teardown(arg)
+    arg = setup()
+    tracemalloc.start()
+    fn(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    teardown(arg)
+    return {
+        "median_ms": statistics.median(times) * 1000,
+        "min_ms": min(times) * 1000,
+        "peak_mb": peak / 1e6,
+    }
+
+
+def search_terms(resume_data) -> List[str]:
+    terms = []
+    for section, items in PDFRedactor.select_items(resume_data, SECTIONS).items():
+        for item in items:
+            terms.extend(PDFRedactor.generate_smart_search_terms(
+                item, PDFRedactor.determine_term_type(item, section)))
+    return terms
+
+
+def match_pages(session: RedactionSession, terms: List[str]) -> List[list]:
+    # the matching loop of redact_pdf_section_wise, without annotating
+    matcher = TermMatcher(terms)
+    pages = []
+    for page_num in range(session.page_count):
+        page = session.doc[page_num]
+        rects = []
+        for term, rect in matcher.search_page(page, session.page_words(page_num)):
+            if PDFRedactor.validate_match_context(page, rect, term):
+                rects.append(rect + (-0.5, -0.5, 0.5, 0.5))
+        pages.append(rects)
+    return pages
+
+
+def redacted_doc(pdf_bytes: bytes, merged: List[list]) -> fitz.Document:
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    for page, rects in zip(doc, merged):
+        for rect in rects:
+            page.add_redact_annot(rect, fill=(0, 0, 0))
+        page.apply_redactions()
+    return doc
+
+
+def bench_config(pdf_bytes: bytes, truth, redactor: PDFRedactor, repeat: int) -> Dict[str, Any]:
+    open_session = lambda: RedactionSession(pdf_bytes)  # noqa: E731
+    close = lambda session: session.close()  # noqa: E731
+    terms = search_terms(truth)
+    with RedactionSession(pdf_bytes) as session:
+        matched = match_pages(session, terms)
+        page_count = session.page_count
+    merged = [PDFRedactor.merge_overlapping_rects(rects, COALESCE_GAP) for rects in matched]
+    selected = PDFRedactor.select_items(truth, SECTIONS)
+
+    def end_to_end(_):
+        with RedactionSession(pdf_bytes) as session:
+            redactor.extract_text(session)
+            resume_data = redactor.detect_document(session)
+            PDFRedactor.find_images(session)
+            return PDFRedactor.redact_pdf_section_wise(
+                session, resume_data, dict.fromkeys(SECTIONS, True), True,
+                PDFRedactor.select_items(resume_data, SECTIONS))
+
+    stages = {
+        "parse": measure(lambda _: RedactionSession(pdf_bytes).close(), repeat=repeat),
+        "extract_text": measure(lambda _: PDFRedactor.extract_text(pdf_bytes), repeat=repeat),
+        "detect": measure(lambda session: redactor.detect_document(session), open_session, close, repeat),
+        "search_terms": measure(lambda _: search_terms(truth), repeat=repeat),
+        "match": measure(lambda session: match_pages(session, terms), open_session, close, repeat),
+        "merge_rects": measure(lambda _: [PDFRedactor.merge_overlapping_rects(rects, COALESCE_GAP)
+                                          for rects in matched], repeat=repeat),
+        "find_images": measure(lambda session: PDFRedactor.find_images(session), open_session, close, repeat),
+        "write": measure(lambda doc: doc.write(), lambda: redacted_doc(pdf_bytes, merged),
+                         lambda doc: doc.close(), repeat),
+        "redact": measure(lambda _: PDFRedactor.redact_pdf_section_wise(
+            pdf_bytes, truth, dict.fromkeys(SECTIONS, True), True, selected), repeat=repeat),
+        "end_to_end": measure(end_to_end, repeat=repeat),
+    }
+    seconds = stages["end_to_end"]["median_ms"] / 1000
+    return {
+        "pages": page_count,
+        "pdf_bytes": len(pdf_bytes),
+        "terms": len(terms),
+        "text_redactions": sum(len(rects) for rects in merged),
+        "stages": stages,
+        "pages_per_second": page_count / seconds if seconds else None,
+        "documents_per_second": 1 / seconds if seconds else None,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for name, config in current["configs"].items():
+        base = baseline.get("configs", {}).get(name)
+        if base is None:
+            continue
+        for stage, result in config["stages"].items():
+            before = base["stages"].get(stage)
+            if before is None:
+                continue
+            for metric in ("median_ms", "peak_mb"):
+                # ignore noise on stages too small to measure reliably
+                floor = 1.0 if metric == "median_ms" else 0.1
+                if result[metric] > max(before[metric], floor) * (1 + tolerance):
+                    regressions.append(f"{name} {stage} {metric}: {before[metric]:.2f} -> {result[metric]:.2f}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", default="1,4,16", help="comma-separated page counts, one config each")
+    parser.add_argument("--density", type=float, default=0.15, help="fraction of lines mentioning a term")
+    parser.add_argument("--columns", type=int, default=1)
+    parser.add_argument("--images", type=int, default=1, help="images per page")
+    parser.add_argument("--image-size", type=int, default=400)
+    parser.add_argument("--fonts", default=",".join(FONTS), help="comma-separated base-14 font names")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub detection latency in seconds")
+    parser.add_argument("--output", help="write results as JSON to this path (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative growth before a stage counts as a regression")
+    args = parser.parse_args()
+
+    fonts = [name.strip() for name in args.fonts.split(",") if name.strip()]
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pymupdf": fitz.VersionBind,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "options": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "configs": {},
+    }
+    for pages in [int(p) for p in args.pages.split(",")]:
+        pdf_bytes, truth = build_resume(pages=pages, density=args.density, fonts=fonts, images=args.images,
+                                        image_size=args.image_size, columns=args.columns, seed=args.seed)
+        server, url = start_stub_server(latency=args.latency, result=truth.model_dump())
+        client = DetectionClient("stub", url)
+        try:
+            name = f"pages={pages}"
+            results["configs"][name] = bench_config(pdf_bytes, truth, PDFRedactor("stub", client=client),
+                                                    args.repeat)
+        finally:
+            client.close()
+            server.shutdown()
+        config = results["configs"][name]
+        summary = "  ".join(f"{stage} {r['median_ms']:.1f}" for stage, r in config["stages"].items())
+        print(f"{name}: {config['pages_per_second']:.1f} pages/s | ms: {summary}", file=sys.stderr)
+    results["meta"]["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""Measure how much prompt compaction and section trimming shrink detection prompts.
+
+Builds synthetic resumes (see ``synthetic.py``) and stamps a running header
+and a "Page n of N" footer on every page, as exported CVs often have, then
+reports the estimated prompt tokens for the raw text with the full schema
+against the compacted text for each section selection:
+
+    python benchmarks/bench_prompt.py --documents 8 --pages 3 --columns 2
+
+With ``--check`` every document is also detected through the local stub in
+echo mode, once with the text only normalized and once with running headers
+and footers dropped as well, and the script exits 1 if dropping them lost
+any value.
+"""
+import argparse
+import os
+import statistics
+import sys
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_redactor.compaction import compact_pages  # noqa: E402
+from resume_redactor.detection_client import DetectionClient, estimate_tokens  # noqa: E402
+from resume_redactor.redactor import PDFRedactor  # noqa: E402
+from resume_redactor.session import RedactionSession  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+from synthetic import build_resume  # noqa: E402
+
+SELECTIONS = {
+    "all": None,
+    "personal_info": ["personal_info"],
+    "personal_info,experience": ["personal_info", "experience"],
+}
+
+
+def stamp(pdf_bytes: bytes, name: str) -> bytes:
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    for page in doc:
+        page.insert_text((50, 30), f"{name}   ·   Curriculum   Vitae", fontsize=8)
+        page.insert_text((50, page.rect.height - 25), f"Page {page.number + 1} of {doc.page_count}", fontsize=8)
+    data = doc.write()
+    doc.close()
+    return data
+
+
+def values(resume_data) -> set:
+    return {(section, field, " ".join(v.split()).lower())
+            for section, fields in resume_data.model_dump().items()
+            for field, items in fields.items() for v in items}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--columns", type=int, default=2)
+    parser.add_argument("--check", action="store_true", help="compare echo-stub detection on raw vs compacted text")
+    args = parser.parse_args()
+
+    ratios = {label: [] for label in SELECTIONS}
+    lost = 0
+    server = client = None
+    if args.check:
+        server, api_url = start_stub_server(echo=True)
+        client = DetectionClient("stub", api_url)
+    try:
+        for seed in range(args.documents):
+            pdf_bytes, truth = build_resume(pages=args.pages, columns=args.columns, seed=seed)
+            pdf_bytes = stamp(pdf_bytes, truth.personal_info.names[0])
+            with RedactionSession(pdf_bytes) as session:
+                pages = session.page_texts()
+            raw = "\n".join(pages)
+            compacted = "\n".join(compact_pages(pages))
+            before = estimate_tokens(PDFRedactor.build_prompt(raw))
+            for label, sections in SELECTIONS.items():
+                ratios[label].append(estimate_tokens(PDFRedactor.build_prompt(compacted, sections=sections)) / before)
+            if client is not None:
+                redactor = PDFRedactor("stub", client=client)
+                # without its pages the text is only normalized, not deduplicated
+                plain = values(redactor.detect_resume_info(raw))
+                missing = plain - values(redactor.detect_resume_info(raw, pages=pages))
+                lost += len(missing)
+                for item in sorted(missing):
+                    print(f"  seed {seed} lost {'.'.join(item[:2])}: {item[2]}")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print(f"{args.documents} documents, {args.pages} pages, {args.columns} column(s)")
+    for label, values_ in ratios.items():
+        print(f"{label:26s} prompt tokens {statistics.mean(values_):6.1%} of raw "
+              f"(min {min(values_):.1%}, max {max(values_):.1%})")
+    if args.check:
+        print(f"values lost to compaction: {lost}")
+    return 1 if lost else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+"""Measure how long a fresh interpreter takes to import the redaction engine.
+
+Process-pool workers, CLI runs and serverless handlers all start with a cold
+interpreter, and each pays for whatever the engine imports at module level.
+For every target this script starts ``--runs`` fresh interpreters, times the
+import alone and records which heavy dependencies it loaded, then prints
+the median next to the cost of the heavy dependencies themselves:
+
+    python benchmarks/bench_startup.py --runs 7 --budget-ms 60
+
+The package is compiled to bytecode first, as an installed package would
+be. The exit status is 1 if an engine import loads PyMuPDF, ``requests``,
+pydantic, asyncio, Streamlit or ``python-dotenv``, or takes longer than
+``--budget-ms``.
+"""
+import argparse
+import compileall
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("fitz", "pymupdf", "requests", "pydantic", "asyncio", "streamlit", "dotenv")
+# imports that must stay light, and what a cold start of each stands for
+ENGINE = {
+    "resume_redactor": "package",
+    "resume_redactor.redactor": "PDFRedactor, STOP_WORDS, term logic",
+    "resume_redactor.plan": "plans",
+    "resume_redactor.parallel": "page worker module",
+    "resume_redactor.cli": "batch CLI worker module",
+}
+# for comparison: what the engine used to pull in at import time
+REFERENCE = ("resume_redactor.models", "fitz", "requests", "streamlit")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(module: str):
+    """Import ``module`` in a fresh interpreter; return its import time and the heavy modules it loaded."""
+    result = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+                            capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(module: str, runs: int):
+    samples = [probe(module) for _ in range(runs)]
+    if any(sample is None for sample in samples):
+        return None, []
+    return statistics.median(s["ms"] for s in samples), samples[0]["loaded"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=60.0,
+                        help="largest median import time allowed for an engine module")
+    args = parser.parse_args()
+
+    compileall.compile_dir(os.path.join(ROOT, "resume_redactor"), quiet=1)
+    failures = 0
+    print(f"median import time over {args.runs} fresh interpreters")
+    for module, label in ENGINE.items():
+        median, loaded = measure(module, args.runs)
+        if median is None:
+            print(f"{module:28s} import failed")
+            failures += 1
+            continue
+        over = median > args.budget_ms
+        failures += bool(loaded) + over
+        note = f"  loads {', '.join(loaded)}" if loaded else ""
+        print(f"{module:28s} {median:7.1f} ms{'  over budget' if over else ''}{note}  ({label})")
+    for module in REFERENCE:
+        median, _ = measure(module, args.runs)
+        shown = "not installed" if median is None else f"{median:7.1f} ms"
+        print(f"{module:28s} {shown}  (reference)")
+    print(f"budget {args.budget_ms:.0f} ms, {failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
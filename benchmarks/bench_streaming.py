@@ -0,0 +1,84 @@
+"""Compare time to first detected field with and without streamed completions.
+
+Runs detection on synthetic resumes (see ``synthetic.py``) against the local
+stub in echo mode, which streams its answer as server-sent events a few
+characters at a time when asked to. For each document it detects once with
+a blocking request and once streamed with an ``on_field`` callback, and
+reports when the first field was available and when the whole result was:
+
+    python benchmarks/bench_streaming.py --documents 5 --latency 0.4 --token-latency 0.01
+
+The exit status is 1 if a streamed result differs from the blocking one, or
+if a field reported while streaming differs from the same field in the
+final result.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_redactor.detection_client import DetectionClient  # noqa: E402
+from resume_redactor.redactor import PDFRedactor  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+from synthetic import build_resume  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.4, help="stub time to first token in seconds")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="stub delay per streamed event")
+    parser.add_argument("--mode", choices=("llm", "hybrid"), default="llm")
+    args = parser.parse_args()
+
+    server, api_url = start_stub_server(echo=True, latency=args.latency, token_latency=args.token_latency)
+    client = DetectionClient("stub", api_url)
+    rows = []
+    mismatches = 0
+    try:
+        for seed in range(args.documents):
+            pdf_bytes, _ = build_resume(pages=args.pages, seed=seed)
+            redactor = PDFRedactor("stub", client=client)
+            start = time.perf_counter()
+            blocking = redactor.detect_document(pdf_bytes, args.mode)
+            blocking_s = time.perf_counter() - start
+
+            fields = {}
+            first = []
+
+            def on_field(section, field, values):
+                first.append(first[0] if first else time.perf_counter())
+                fields[(section, field)] = values
+
+            start = time.perf_counter()
+            streamed = redactor.detect_document(pdf_bytes, args.mode, on_field=on_field)
+            streamed_s = time.perf_counter() - start
+            if redactor.last_error:
+                print(f"seed {seed}: {redactor.last_error}")
+                mismatches += 1
+            if streamed != blocking:
+                print(f"seed {seed}: streamed result differs from blocking result")
+                mismatches += 1
+            final = streamed.model_dump()
+            for (section, field), values in fields.items():
+                if final[section][field] != values:
+                    print(f"seed {seed}: {section}.{field} streamed {values}, final {final[section][field]}")
+                    mismatches += 1
+            rows.append((blocking_s, (first[0] - start) if first else streamed_s, streamed_s, len(fields)))
+    finally:
+        server.shutdown()
+
+    for label, index in (("blocking result", 0), ("first field", 1), ("streamed result", 2)):
+        values = [row[index] for row in rows]
+        print(f"{label:16s} mean {statistics.mean(values) * 1000:7.0f} ms  max {max(values) * 1000:7.0f} ms")
+    print(f"{statistics.mean(row[3] for row in rows):.1f} fields reported per document, {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
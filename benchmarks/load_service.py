@@ -0,0 +1,173 @@
+"""Load-test the HTTP service and report latency percentiles and throughput.
+
+By default starts everything locally: the stub completions endpoint (in
+``--echo`` mode, so detection answers come from the resume text) and
+``python -m resume_redactor.service`` pointed at it, then sends synthetic
+resumes (see ``synthetic.py``) from ``--concurrency`` client threads:
+
+    python benchmarks/load_service.py --requests 200 --concurrency 16 --workers 2 --queue-size 4
+
+``--url`` targets a running service instead. Requests answered 429 are
+counted separately and, with ``--retry``, retried after ``Retry-After``;
+their latency then includes the waits. ``--async`` submits jobs and polls
+for the result instead of waiting on the request.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_openai import start_stub_server  # noqa: E402
+from synthetic import build_resume  # noqa: E402
+
+ENDPOINTS = {
+    "redact": "/v1/redact?sections=personal_info,education,experience&redact_images=1",
+    "detect": "/v1/detect",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_service(args, api_url: str) -> subprocess.Popen:
+    port = free_port()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen([sys.executable, "-m", "resume_redactor.service", "--port", str(port),
+                             "--workers", str(args.workers), "--queue-size", str(args.queue_size),
+                             "--detection-mode", args.detection_mode, "--api-url", api_url, "--api-key", "stub",
+                             "--no-cache"], cwd=root)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url + "/healthz", timeout=1).raise_for_status()
+            return proc, url
+        except requests.RequestException:
+            if proc.poll() is not None:
+                raise RuntimeError("service exited during startup")
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("service did not start")
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class Client:
+    def __init__(self, url: str, endpoint: str, use_async: bool, retry: bool):
+        self.url = url
+        self.path = ENDPOINTS[endpoint]
+        self.use_async = use_async
+        self.retry = retry
+        self.local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def call(self, pdf_bytes: bytes) -> Dict:
+        start = time.perf_counter()
+        rejected = 0
+        path = self.path + (("&" if "?" in self.path else "?") + "async=1" if self.use_async else "")
+        while True:
+            response = self.session.post(self.url + path, data=pdf_bytes,
+                                         headers={"Content-Type": "application/pdf"}, timeout=300)
+            if response.status_code != 429 or not self.retry:
+                break
+            rejected += 1
+            time.sleep(float(response.headers.get("Retry-After", 1)))
+        if response.status_code == 202:
+            response = self.poll(response.json()["job_id"])
+        return {"status": response.status_code, "seconds": time.perf_counter() - start, "rejected": rejected,
+                "bytes": len(response.content)}
+
+    def poll(self, job_id: str) -> requests.Response:
+        delay = 0.02
+        while True:
+            job = self.session.get(f"{self.url}/v1/jobs/{job_id}", timeout=30).json()
+            if job["status"] in ("done", "error"):
+                return self.session.get(f"{self.url}/v1/jobs/{job_id}/result", timeout=300)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="running service to test (default: start one locally)")
+    parser.add_argument("--endpoint", choices=tuple(ENDPOINTS), default="redact")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--documents", type=int, default=8, help="distinct synthetic resumes to cycle through")
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="submit jobs and poll")
+    parser.add_argument("--retry", action="store_true", help="retry 429 responses after Retry-After")
+    parser.add_argument("--workers", type=int, default=2, help="service workers when starting one")
+    parser.add_argument("--queue-size", type=int, default=4, help="service queue size when starting one")
+    parser.add_argument("--detection-mode", choices=("llm", "hybrid", "local"), default="llm")
+    parser.add_argument("--latency", type=float, default=0.2, help="stub completion latency in seconds")
+    parser.add_argument("--output", help="also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    documents = [build_resume(pages=args.pages, seed=seed)[0] for seed in range(args.documents)]
+    stub = proc = None
+    url = args.url
+    if url is None:
+        stub, api_url = start_stub_server(latency=args.latency, echo=True)
+        proc, url = start_service(args, api_url)
+    client = Client(url.rstrip("/"), args.endpoint, args.use_async, args.retry)
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(client.call, (documents[i % len(documents)] for i in range(args.requests))))
+        elapsed = time.perf_counter() - start
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+        if stub is not None:
+            stub.shutdown()
+
+    statuses = Counter(r["status"] for r in results)
+    ok = [r["seconds"] for r in results if r["status"] == 200]
+    summary = {
+        "requests": len(results),
+        "concurrency": args.concurrency,
+        "statuses": dict(statuses),
+        "rejected_429": sum(r["rejected"] for r in results) + statuses.get(429, 0),
+        "seconds": elapsed,
+        "throughput_rps": len(ok) / elapsed if elapsed else None,
+        "p50_ms": percentile(ok, 0.50) * 1000 if ok else None,
+        "p99_ms": percentile(ok, 0.99) * 1000 if ok else None,
+        "mean_ms": statistics.mean(ok) * 1000 if ok else None,
+    }
+    print(f"{len(ok)}/{len(results)} ok in {elapsed:.2f} s: {summary['throughput_rps']:.2f} req/s, "
+          f"p50 {summary['p50_ms'] or 0:.0f} ms, p99 {summary['p99_ms'] or 0:.0f} ms, "
+          f"429s {summary['rejected_429']}, statuses {dict(statuses)}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(summary, fh, indent=2)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
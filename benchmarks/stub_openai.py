@@ -0,0 +1,225 @@
+"""Local stand-in for the chat completions endpoint.
+
+Serves canned (or, with ``echo``, text-derived) detection results with
+configurable latency and injected 429/500 failures so the detection client
+can be exercised without network access or API cost. Requests with
+``"stream": true`` are answered with server-sent events, a few characters of
+content per event, ``token_latency`` seconds apart. Use it in-process:
+
+    server, url = start_stub_server(latency=0.2, error_rate=0.1)
+    ...
+    server.shutdown()
+
+or standalone:
+
+    python benchmarks/stub_openai.py --port 8765 --latency 0.2 --rate-limit-rate 0.1
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CANNED_RESULT = {
+    "personal_info": {
+        "emails": ["jane.doe@example.com"],
+        "phone_numbers": ["(555) 123-4567"],
+        "names": ["Jane Q. Doe"],
+        "addresses": [],
+        "linkedin_urls": [],
+        "github_urls": [],
+        "other_urls": [],
+        "locations": ["Springfield"],
+    },
+    "education": {
+        "institutions": ["State University of Springfield"],
+        "graduation_years": ["2015"],
+    },
+    "experience": {
+        "companies": ["Acme Inc.", "Globex Corp."],
+        "project_titles": ["Realtime Analytics Platform"],
+    },
+}
+
+
+class StubOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 0.1,
+                 result: Optional[Dict[str, Any]] = None, seed: Optional[int] = None,
+                 latency_per_1k_chars: float = 0.0, echo: bool = False, token_latency: float = 0.0,
+                 stream_chunk_chars: int = 4):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.latency_per_1k_chars = latency_per_1k_chars
+        self.echo = echo
+        self.token_latency = token_latency
+        self.stream_chunk_chars = stream_chunk_chars
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.result = result if result is not None else CANNED_RESULT
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "in_flight": 0, "max_in_flight": 0}
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.random.random()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubOpenAIServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, content: str, usage: Optional[Dict[str, Any]]) -> None:
+        server = self.server
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def send(event: Dict[str, Any]) -> None:
+            self.wfile.write(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n")
+            self.wfile.flush()
+
+        send({"choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}}]})
+        step = max(1, server.stream_chunk_chars)
+        for start in range(0, len(content), step):
+            if server.token_latency:
+                time.sleep(server.token_latency)
+            send({"choices": [{"index": 0, "delta": {"content": content[start:start + step]}}]})
+        send({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if usage is not None:
+            send({"choices": [], "usage": usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        with server.lock:
+            server.stats["requests"] += 1
+            server.stats["in_flight"] += 1
+            server.stats["max_in_flight"] = max(server.stats["max_in_flight"], server.stats["in_flight"])
+        try:
+            prompt = "".join(str(m.get("content", "")) for m in payload.get("messages", []))
+            delay = (server.latency + server.jitter * server.roll()
+                     + server.latency_per_1k_chars * len(prompt) / 1000)
+            if delay:
+                time.sleep(delay)
+            roll = server.roll()
+            if roll < server.rate_limit_rate:
+                with server.lock:
+                    server.stats["rate_limited"] += 1
+                self._reply(429, {"error": {"message": "rate limited"}},
+                            {"Retry-After": str(server.retry_after)})
+                return
+            if roll < server.rate_limit_rate + server.error_rate:
+                with server.lock:
+                    server.stats["errors"] += 1
+                self._reply(500, {"error": {"message": "stub failure"}})
+                return
+            result = echo_result(prompt) if server.echo else server.result
+            response_format = payload.get("response_format") or {}
+            if response_format.get("type") == "json_schema":
+                result = conform(result, response_format["json_schema"]["schema"])
+            content = json.dumps(result)
+            usage = {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4,
+            }
+            if payload.get("stream"):
+                include_usage = (payload.get("stream_options") or {}).get("include_usage")
+                self._stream(content, usage if include_usage else None)
+                return
+            if server.token_latency:
+                # the model generates the same tokens either way; unstreamed, they arrive at once
+                time.sleep(server.token_latency * -(-len(content) // max(1, server.stream_chunk_chars)))
+            self._reply(200, {
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                "usage": usage,
+            })
+        finally:
+            with server.lock:
+                server.stats["in_flight"] -= 1
+
+
+def echo_result(prompt: str) -> Dict[str, Any]:
+    """Derive a result from the resume text in the prompt using the local regex tier.
+
+    Gives every chunk a different, text-dependent answer so merged chunked
+    results can be checked against single-shot ones.
+    """
+    from resume_redactor.local_detection import detect_local
+
+    text = prompt.split("Resume text:", 1)[-1]
+    return detect_local(text).model_dump()
+
+
+def conform(result: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the sections and fields a structured-output schema asks for, as a strict backend would."""
+    return {section: {field: list((result.get(section) or {}).get(field) or [])
+                      for field in spec["properties"]}
+            for section, spec in schema["properties"].items()}
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, **options) -> Tuple[StubOpenAIServer, str]:
+    """Start the stub on a background thread and return it with its completions URL."""
+    server = StubOpenAIServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1/chat/completions"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the chat completions endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    parser.add_argument("--latency-per-1k-chars", type=float, default=0.0,
+                        help="extra delay per 1000 prompt characters, to model long prompts")
+    parser.add_argument("--echo", action="store_true",
+                        help="answer from the prompt text with the local regex tier instead of a canned result")
+    parser.add_argument("--token-latency", type=float, default=0.0,
+                        help="delay between streamed content events in seconds")
+    args = parser.parse_args()
+    server = StubOpenAIServer((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                              error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                              retry_after=args.retry_after, latency_per_1k_chars=args.latency_per_1k_chars,
+                              echo=args.echo, token_latency=args.token_latency)
+    print(f"stub listening on http://{args.host}:{server.server_address[1]}/v1/chat/completions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Reproducible synthetic resumes for benchmarks.
+
+``build_resume`` lays out a CV with PyMuPDF and returns the PDF bytes together
+with the ``ResumeData`` a perfect detector would report for it, so the
+pipeline can run end to end against a canned detection response. Everything
+is driven by a seeded ``random.Random``: the same options always produce the
+same bytes.
+
+    pdf_bytes, truth = build_resume(pages=4, density=0.2, columns=2, images=1)
+"""
+import os
+import random
+import sys
+from typing import List, Sequence, Tuple
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_redactor.models import ResumeData  # noqa: E402
+
+FONTS = ("helv", "tiro", "cour")
+FIRST_NAMES = ["Jane", "Arjun", "Maria", "Kenji", "Amara", "Lukas", "Priya", "Diego"]
+LAST_NAMES = ["Doe", "Sharma", "Garcia", "Tanaka", "Okafor", "Schmidt", "Iyer", "Alvarez"]
+COMPANIES = ["Acme Inc.", "Globex Corp.", "Initech LLC", "Umbrella Ltd.", "Hooli", "Stark Industries",
+             "Wayne Enterprises", "Cyberdyne Systems"]
+INSTITUTIONS = ["State University of Springfield", "Shelbyville Institute of Technology",
+                "Capital City College", "Ogdenville Polytechnic"]
+DEGREES = ["B.Sc. Computer Science", "M.Sc. Data Science", "MBA", "B.Eng. Electrical Engineering"]
+PROJECTS = ["Realtime Analytics Platform", "Payments Gateway Rewrite", "Fleet Telemetry Pipeline",
+            "Search Relevance Toolkit", "Mobile Checkout Redesign"]
+TITLES = ["Senior Software Engineer", "Data Engineer", "Engineering Manager", "Platform Architect"]
+CITIES = ["Springfield", "Shelbyville", "Capital City", "Ogdenville"]
+FILLER = [
+    "designed", "platform", "scalable", "pipeline", "python", "delivered", "customers", "latency",
+    "reduced", "migrated", "services", "team", "led", "built", "analytics", "dashboard", "cloud",
+    "infrastructure", "automation", "testing", "mentored", "roadmap", "observability", "budget",
+]
+
+
+def make_truth(rng: random.Random) -> ResumeData:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first}.{last}".lower()
+    start = rng.randint(2005, 2015)
+    return ResumeData.model_validate({
+        "personal_info": {
+            "names": [f"{first} {last}"],
+            "emails": [f"{handle}@example.com"],
+            "phone_numbers": [f"+1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}"],
+            "linkedin_urls": [f"linkedin.com/in/{handle.replace('.', '-')}"],
+            "github_urls": [f"github.com/{handle.replace('.', '')}"],
+            "locations": [rng.choice(CITIES)],
+        },
+        "education": {
+            "institutions": rng.sample(INSTITUTIONS, 2),
+            "degrees": rng.sample(DEGREES, 2),
+            "graduation_years": [str(start - 4), str(start - 2)],
+        },
+        "experience": {
+            "companies": rng.sample(COMPANIES, 4),
+            "job_titles": rng.sample(TITLES, 2),
+            "project_titles": rng.sample(PROJECTS, 3),
+            "employment_dates": [f"{start} - {start + 3}", f"{start + 3} - Present"],
+        },
+    })
+
+
+def _terms(truth: ResumeData) -> List[str]:
+    terms = []
+    for section in (truth.personal_info, truth.education, truth.experience):
+        for values in section.model_dump().values():
+            terms.extend(values)
+    return terms
+
+
+def _image(rng: random.Random, size: int) -> fitz.Pixmap:
+    # flat patches compress like real photos/logos rather than like noise
+    samples = bytearray([rng.randrange(256)]) * (size * size * 3)
+    patch = size // 4
+    for _ in range(12):
+        x, y = rng.randrange(size - patch), rng.randrange(size - patch)
+        color = bytes([rng.randrange(256), rng.randrange(256), rng.randrange(256)]) * patch
+        for row in range(y, y + patch):
+            start = (row * size + x) * 3
+            samples[start:start + patch * 3] = color
+    return fitz.Pixmap(fitz.csRGB, size, size, bytes(samples), 0)
+
+
+def _columns(page: fitz.Page, columns: int) -> List[fitz.Rect]:
+    width = page.rect.width - 100
+    gutter = 18
+    col_width = (width - gutter * (columns - 1)) / columns
+    return [fitz.Rect(50 + i * (col_width + gutter), 110, 50 + i * (col_width + gutter) + col_width,
+                      page.rect.height - 60) for i in range(columns)]
+
+
+def build_resume(pages: int = 2, density: float = 0.15, fonts: Sequence[str] = FONTS,
+                 images: int = 1, image_size: int = 400, columns: int = 1, fontsize: float = 9,
+                 seed: int = 1) -> Tuple[bytes, ResumeData]:
+    """Return ``(pdf_bytes, truth)`` for a synthetic resume.
+
+    ``density`` is the fraction of body lines that mention a detected term,
+    ``fonts`` are cycled per line, ``images`` is the number of images per page
+    (the first page's first image is the profile photo, later pages reuse it
+    as a logo) and ``columns`` splits the body into that many text columns.
+    """
+    rng = random.Random(seed)
+    truth = make_truth(rng)
+    terms = _terms(truth)
+    personal = truth.personal_info
+    loaded = []
+    for name in fonts:
+        font = fitz.Font(name)
+        loaded.append((font, {word: font.text_length(word, fontsize=fontsize) for word in FILLER + [" "]}))
+    doc = fitz.open()
+    doc.set_metadata({})
+    photo = None
+    line_no = 0
+    for page_num in range(pages):
+        page = doc.new_page()
+        if page_num == 0:
+            page.insert_text((50, 60), personal.names[0], fontsize=20, fontname=fonts[0])
+            page.insert_text((50, 80), f"{personal.emails[0]} | {personal.phone_numbers[0]} | "
+                                       f"{personal.locations[0]}", fontsize=10, fontname=fonts[0])
+            page.insert_text((50, 94), f"{personal.linkedin_urls[0]} | {personal.github_urls[0]}",
+                             fontsize=10, fontname=fonts[0])
+        else:
+            page.insert_text((50, 60), f"{personal.names[0]} - page {page_num + 1}", fontsize=10,
+                             fontname=fonts[0])
+        for index in range(images):
+            box = fitz.Rect(page.rect.width - 130 - index * 90, 40, page.rect.width - 50 - index * 90, 100)
+            if photo is None:
+                photo = page.insert_image(box, pixmap=_image(rng, image_size))
+            elif index == 0:
+                page.insert_image(box, xref=photo)
+            else:
+                page.insert_image(box, pixmap=_image(rng, image_size))
+        # one TextWriter per page: insert_text per line rewrites the content stream every time
+        writer = fitz.TextWriter(page.rect)
+        for column in _columns(page, columns):
+            y = column.y0
+            while y < column.y1:
+                font, widths = loaded[line_no % len(loaded)]
+                term = rng.choice(terms) if rng.random() < density else ""
+                used = font.text_length(term + " ", fontsize=fontsize) if term else -widths[" "]
+                words = []
+                while True:
+                    word = rng.choice(FILLER)
+                    used += widths[" "] + widths[word]
+                    if used > column.width:
+                        break
+                    words.append(word)
+                if term:
+                    words.insert(rng.randrange(len(words) + 1), term)
+                writer.append((column.x0, y), " ".join(words), font=font, fontsize=fontsize)
+                line_no += 1
+                y += fontsize * 1.4
+        writer.write_text(page)
+    data = doc.write(garbage=1, deflate=True, no_new_id=True)
+    doc.close()
+    return data, truth
@@ -0,0 +1,103 @@
+"""Check chunked detection against single-shot detection on a fixture set.
+
+For every document both modes run against the same endpoint. The script
+reports, per document, latency for each mode and any field values that
+single-shot found but the merged chunked result lost (and vice versa).
+
+By default it generates long synthetic CVs and uses the local stub in echo
+mode, where answers depend on the prompt text and latency grows with prompt
+size. Point it at real PDFs and the real API with:
+
+    python benchmarks/validate_chunked_detection.py cvs/*.pdf --api-url https://... --api-key sk-...
+"""
+import argparse
+import os
+import sys
+import time
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_redactor.detection_client import DetectionClient  # noqa: E402
+from resume_redactor.models import ResumeData  # noqa: E402
+from resume_redactor.redactor import PDFRedactor  # noqa: E402
+from resume_redactor.session import RedactionSession  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+
+
+def build_long_cv(pages: int, seed: int) -> bytes:
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        lines = [
+            f"Section {n + 1} - contact person{seed}.{n}@example.com, +1 555-{seed:03d}-{1000 + n}",
+            f"Portfolio https://github.com/user{seed}/project{n}",
+            f"Worked {1990 + n} to {1991 + n} on publication {n} of candidate {seed}",
+        ]
+        lines += [f"Research notes line {i} for page {n} of candidate {seed}." for i in range(40)]
+        page.insert_text((50, 60), "\n".join(lines), fontsize=9)
+    data = doc.write()
+    doc.close()
+    return data
+
+
+def field_diff(single: ResumeData, chunked: ResumeData):
+    missing, extra = [], []
+    a, b = single.model_dump(), chunked.model_dump()
+    for section, fields in a.items():
+        for field, items in fields.items():
+            left = {" ".join(i.split()).lower() for i in items}
+            right = {" ".join(i.split()).lower() for i in b[section][field]}
+            missing += [f"{section}.{field}: {v}" for v in sorted(left - right)]
+            extra += [f"{section}.{field}: {v}" for v in sorted(right - left)]
+    return missing, extra
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", help="fixture PDFs (default: generated long CVs)")
+    parser.add_argument("--documents", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--chunk-chars", type=int, default=6000)
+    parser.add_argument("--api-url", default=None, help="default: start the local echo stub")
+    parser.add_argument("--api-key", default="stub")
+    parser.add_argument("--latency-per-1k-chars", type=float, default=0.05)
+    args = parser.parse_args()
+
+    server = None
+    api_url = args.api_url
+    if api_url is None:
+        server, api_url = start_stub_server(echo=True, latency=0.05,
+                                            latency_per_1k_chars=args.latency_per_1k_chars)
+    fixtures = [(path, open(path, "rb").read()) for path in args.pdfs] or [
+        (f"synthetic-{i}", build_long_cv(args.pages, i)) for i in range(args.documents)
+    ]
+    client = DetectionClient(args.api_key, api_url, max_in_flight=16)
+    failures = 0
+    for name, pdf_bytes in fixtures:
+        with RedactionSession(pdf_bytes) as session:
+            pages = session.page_texts()
+        redactor = PDFRedactor(args.api_key, client=client)
+        start = time.perf_counter()
+        single = redactor.detect_resume_info("\n".join(pages))
+        single_s = time.perf_counter() - start
+        start = time.perf_counter()
+        chunked = redactor.detect_resume_info_chunked(pages, max_chars=args.chunk_chars)
+        chunked_s = time.perf_counter() - start
+        chunks = redactor.last_report.get("chunks")
+        missing, extra = field_diff(single, chunked)
+        failures += bool(missing)
+        print(f"{name}: single {single_s:5.2f}s  chunked {chunked_s:5.2f}s ({chunks} chunks)  "
+              f"missing={len(missing)} extra={len(extra)}")
+        for line in missing:
+            print(f"    missing {line}")
+    if server is not None:
+        server.shutdown()
+    client.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
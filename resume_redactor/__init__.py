@@ -0,0 +1,33 @@
+"""Redaction engine components shared by the Streamlit app.
+
+The engine is importable on its own, without Streamlit. The names below are
+resolved on first access, and the modules behind them import PyMuPDF,
+``requests`` and pydantic only when they first need them, so
+``import resume_redactor`` costs a few milliseconds.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "PDFRedactor": "resume_redactor.redactor",
+    "STOP_WORDS": "resume_redactor.redactor",
+    "ResumeData": "resume_redactor.models",
+    "RedactionPlan": "resume_redactor.plan",
+    "RedactionSession": "resume_redactor.session",
+    "DetectionCache": "resume_redactor.detection_cache",
+    "DetectionClient": "resume_redactor.detection_client",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,3 @@
+from resume_redactor.cli import main
+
+raise SystemExit(main())
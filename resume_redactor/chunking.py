@@ -0,0 +1,75 @@
+"""Split long resumes into detection-sized chunks and merge the per-chunk results."""
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from resume_redactor.models import ResumeData
+
+DEFAULT_CHUNK_CHARS = 12000
+
+
+def chunk_pages(pages: List[str], max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """Pack whole pages into chunks of at most ``max_chars``.
+
+    A single page longer than the budget is split on line boundaries, and a
+    single line longer than the budget is hard-split.
+    """
+    pieces = []
+    for page in pages:
+        if len(page) <= max_chars:
+            pieces.append(page)
+            continue
+        current = []
+        size = 0
+        for line in page.splitlines(keepends=True):
+            while len(line) > max_chars:
+                if current:
+                    pieces.append("".join(current))
+                    current, size = [], 0
+                pieces.append(line[:max_chars])
+                line = line[max_chars:]
+            if size + len(line) > max_chars and current:
+                pieces.append("".join(current))
+                current, size = [], 0
+            current.append(line)
+            size += len(line)
+        if current:
+            pieces.append("".join(current))
+    chunks = []
+    current = []
+    size = 0
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        # +1 for the newline that joins pieces back together
+        if current and size + len(piece) + 1 > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _dedupe_key(item: str) -> str:
+    return " ".join(item.split()).lower()
+
+
+def merge_results(results: List["ResumeData"]) -> "ResumeData":
+    """Union per-chunk results field by field, keeping first-seen order and spelling."""
+    from resume_redactor.models import ResumeData
+
+    merged: Dict[str, Dict[str, List[str]]] = {}
+    seen: Dict[tuple, set] = {}
+    for result in results:
+        for section, fields in result.model_dump().items():
+            target = merged.setdefault(section, {})
+            for field, items in fields.items():
+                values = target.setdefault(field, [])
+                keys = seen.setdefault((section, field), set())
+                for item in items:
+                    key = _dedupe_key(item)
+                    if key and key not in keys:
+                        keys.add(key)
+                        values.append(item)
+    return ResumeData.model_validate(merged)
@@ -0,0 +1,316 @@
+"""Headless batch redaction for directories of resumes.
+
+    python -m resume_redactor resumes/ --output-dir redacted/ --workers 8 \
+        --sections personal_info,experience --term-types email,phone,name,url
+
+Documents are spread across a process pool. Detection calls share a bounded
+semaphore so the number of in-flight API requests stays capped regardless of
+the pool size. Every finished document is appended to a JSONL manifest, and
+``--resume`` skips inputs the manifest already records as done. A worker
+that dies takes the pool down with it; the inputs it leaves unfinished are
+recorded as errors, so ``--resume`` retries them.
+"""
+import argparse
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from resume_redactor.detection_cache import DetectionCache
+from resume_redactor.detection_client import DetectionClient
+from resume_redactor.local_detection import covers
+from resume_redactor.metrics import METRICS, PROFILE_MODES, collect, profiled
+from resume_redactor.output import OUTPUT_PROFILES
+from resume_redactor.chunking import DEFAULT_CHUNK_CHARS
+from resume_redactor.parallel import PARALLEL_MIN_PAGES
+from resume_redactor.plan import RedactionPlan
+from resume_redactor.redactor import COALESCE_GAP, OPENAI_API_URL, PDFRedactor
+from resume_redactor.session import RedactionSession
+
+if TYPE_CHECKING:
+    from resume_redactor.models import ResumeData
+
+logger = logging.getLogger(__name__)
+events_logger = logging.getLogger("resume_redactor.metrics")
+
+SECTIONS = ("personal_info", "education", "experience")
+TERM_TYPES = ("email", "phone", "url", "name", "institution", "degree", "year",
+              "company", "date", "project", "general")
+DEFAULT_CACHE_PATH = os.path.join(".cache", "detections.sqlite")
+
+_worker: Dict[str, Any] = {}
+
+
+def collect_inputs(patterns: List[str], recursive: bool = False) -> List[Tuple[str, str]]:
+    """Expand directories and globs into ``(path, output_name)`` pairs."""
+    found = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            root = pattern
+            matches = glob.glob(os.path.join(pattern, "**", "*.pdf") if recursive
+                                else os.path.join(pattern, "*.pdf"), recursive=recursive)
+        else:
+            root = None
+            matches = glob.glob(pattern, recursive=recursive)
+        for path in matches:
+            if not os.path.isfile(path) or not path.lower().endswith(".pdf"):
+                continue
+            name = os.path.relpath(path, root) if root else os.path.basename(path)
+            found.setdefault(os.path.abspath(path), name)
+    return sorted(found.items())
+
+
+def load_manifest(path: str) -> Dict[str, Dict[str, Any]]:
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # a run killed mid-write can leave a truncated last line
+                continue
+            if record.get("status") == "ok":
+                done[record["input"]] = record
+    return done
+
+
+def load_plan(path: str) -> RedactionPlan:
+    """Load a saved plan (``.json``) or build one from a text file with one term per line."""
+    if path.lower().endswith(".json"):
+        return RedactionPlan.load(path)
+    with open(path, encoding="utf-8") as fh:
+        terms = [line.strip() for line in fh if line.strip() and not line.lstrip().startswith("#")]
+    return RedactionPlan.from_terms(terms, source=os.path.basename(path))
+
+
+def _init_worker(api_key: str, cache_path: Optional[str], limiter, client_options: Dict[str, Any],
+                 plan_json: Optional[str] = None) -> None:
+    cache = DetectionCache(cache_path) if cache_path else None
+    client = DetectionClient(api_key, **client_options)
+    _worker["redactor"] = PDFRedactor(api_key, cache=cache, client=client)
+    _worker["limiter"] = limiter
+    _worker["plan"] = RedactionPlan.from_json(plan_json) if plan_json else None
+
+
+def resolve_detection_mode(mode: str, term_types: List[str]) -> str:
+    if mode != "auto":
+        return mode
+    return "local" if covers(term_types) else "llm"
+
+
+def detect_document(session: RedactionSession, detection_mode: str, chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                    sections: List[str] = None) -> "ResumeData":
+    """Detect ``sections`` with this worker's redactor; model calls wait for the shared limiter."""
+    redactor = _worker["redactor"]
+    if detection_mode == "local":
+        return redactor.detect_document(session, detection_mode, chunk_chars, sections)
+    with _worker["limiter"]:
+        return redactor.detect_document(session, detection_mode, chunk_chars, sections)
+
+
+def compile_plan(resume_data: "ResumeData", sections: List[str], term_types: List[str]) -> RedactionPlan:
+    """Plan the selected sections and term types, plus this worker's shared plan if any."""
+    selected_items = PDFRedactor.select_items(resume_data, sections, term_types)
+    # an empty selection must not fall back to whole-section redaction
+    selected_sections = {section: True for section in sections} if selected_items else {}
+    plan = RedactionPlan.compile(resume_data, selected_sections, selected_items)
+    if _worker.get("plan") is not None:
+        plan = plan.merged(_worker["plan"])
+    return plan
+
+
+def process_file(path: str, output_path: str, sections: List[str], term_types: List[str],
+                 redact_images: bool, detection_mode: str = "llm",
+                 chunk_chars: int = DEFAULT_CHUNK_CHARS, coalesce_gap: float = COALESCE_GAP,
+                 profile: Optional[str] = None, page_workers: int = 1,
+                 output_profile: str = "compact", memory_budget: Optional[int] = None) -> Dict[str, Any]:
+    redactor = _worker["redactor"]
+    record = {"input": path, "output": output_path, "status": "ok", "error": None}
+    timings = {}
+    start = time.perf_counter()
+    mark = start
+    dump_path = output_path + ".prof" if profile == "cprofile" else None
+    with collect() as events, profiled(profile, dump_path=dump_path) as capture:
+        try:
+            # MuPDF reads the file on demand, so it is never copied into memory whole
+            with RedactionSession(path) as session:
+                record["bytes_in"] = session.size
+                now = time.perf_counter()
+                timings["parse"], mark = now - mark, now
+                text = redactor.extract_text(session)
+                now = time.perf_counter()
+                timings["extract"], mark = now - mark, now
+                if not text.strip():
+                    raise ValueError("no extractable text")
+                resume_data = detect_document(session, detection_mode, chunk_chars, sections)
+                record["detection"] = redactor.last_report
+                now = time.perf_counter()
+                timings["detect"], mark = now - mark, now
+                if redactor.last_error:
+                    raise RuntimeError(redactor.last_error)
+                plan = compile_plan(resume_data, sections, term_types)
+                stats = {"generated_terms": plan.generated}
+                os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+                record["bytes_out"] = PDFRedactor.apply_plan(session, plan, redact_images, stats, coalesce_gap,
+                                                             page_workers, output_path, output_profile,
+                                                             memory_budget)
+                record["output_profile"] = output_profile
+                now = time.perf_counter()
+                timings["redact"], mark = now - mark, now
+            record.update(stats)
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+    timings["total"] = time.perf_counter() - start
+    record["timings"] = {name: round(value, 4) for name, value in timings.items()}
+    record["events"] = events
+    if profile:
+        record["profile"] = capture
+    return record
+
+
+def _split(value: str, allowed: Tuple[str, ...], option: str) -> List[str]:
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [v for v in items if v not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"{option}: unknown value(s) {', '.join(unknown)}")
+    return items
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m resume_redactor",
+                                     description="Redact directories of PDF resumes without the UI.")
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", required=True)
+    parser.add_argument("--sections", default=",".join(SECTIONS),
+                        type=lambda v: _split(v, SECTIONS, "--sections"),
+                        help="comma-separated sections to redact (default: all)")
+    parser.add_argument("--term-types", default="",
+                        type=lambda v: _split(v, TERM_TYPES, "--term-types"),
+                        help="comma-separated term types to keep, e.g. email,phone,name (default: all)")
+    parser.add_argument("--detection-mode", choices=("auto", "llm", "hybrid", "local"), default="auto",
+                        help="local: regex tier only, no API calls; hybrid: regex tier plus the model for "
+                             "the remaining fields; auto (default): local when --term-types only names "
+                             "email/phone/url/year, otherwise llm")
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS,
+                        help="split documents longer than this into concurrently detected chunks (0 disables)")
+    parser.add_argument("--coalesce-gap", type=float, default=COALESCE_GAP,
+                        help="join same-line redaction boxes at most this many points apart (0 disables)")
+    parser.add_argument("--plan", help="also redact the terms of this saved plan (.json) or "
+                                       "text file with one term per line, e.g. a company-wide deny list")
+    parser.add_argument("--redact-images", action="store_true")
+    parser.add_argument("--recursive", action="store_true", help="descend into subdirectories")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--page-workers", type=int, default=1,
+                        help=f"processes per document for page-parallel redaction of documents with at "
+                             f"least {PARALLEL_MIN_PAGES} pages and no outline, links or form fields "
+                             f"(default: 1, serial)")
+    parser.add_argument("--output-profile", choices=tuple(OUTPUT_PROFILES), default="compact",
+                        help="fast: minimal cleanup; compact: garbage collection, deflate, object streams "
+                             "(default); downsample: compact plus lossy image downsampling")
+    parser.add_argument("--memory-budget", type=float, default=None, metavar="MB",
+                        help="large-file mode: redact page windows within this much resident memory per "
+                             "document and fail documents that need more")
+    parser.add_argument("--max-concurrent-detections", type=int, default=4,
+                        help="upper bound on documents in detection at once across all workers; "
+                             "also caps the concurrent chunk requests of one document")
+    parser.add_argument("--manifest", help="JSONL manifest path (default: <output-dir>/manifest.jsonl)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip inputs already recorded as done in the manifest")
+    parser.add_argument("--tokens-per-minute", type=float, default=None,
+                        help="estimated token budget per minute shared by all workers")
+    parser.add_argument("--timeout", type=float, default=120.0, help="read timeout per detection request")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--api-key", default=None, help="defaults to $OPENAI_API_KEY")
+    parser.add_argument("--api-url", default=None, help=f"defaults to $OPENAI_API_URL or {OPENAI_API_URL}")
+    parser.add_argument("--cache-path", default=None,
+                        help=f"detection cache file (default: $DETECTION_CACHE_PATH or {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--metrics-file", help="write an OpenMetrics snapshot of all stages here when done")
+    parser.add_argument("--log-events", action="store_true",
+                        help="log every stage as a JSON event on the resume_redactor.metrics logger")
+    parser.add_argument("--profile", choices=PROFILE_MODES, default=None,
+                        help="capture a per-document profile into the manifest "
+                             "(cprofile also writes <output>.prof)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    api_key = args.api_key or os.getenv("OPENAI_API_KEY", "")
+    cache_path = None if args.no_cache else (
+        args.cache_path or os.getenv("DETECTION_CACHE_PATH", DEFAULT_CACHE_PATH))
+    manifest_path = args.manifest or os.path.join(args.output_dir, "manifest.jsonl")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    inputs = collect_inputs(args.inputs, args.recursive)
+    done = load_manifest(manifest_path) if args.resume else {}
+    pending = [(path, name) for path, name in inputs if path not in done]
+    logger.info("%d inputs, %d already done, %d to process", len(inputs), len(inputs) - len(pending), len(pending))
+
+    plan_json = load_plan(args.plan).to_json() if args.plan else None
+    memory_budget = int(args.memory_budget * 1e6) if args.memory_budget else None
+    detection_mode = resolve_detection_mode(args.detection_mode, args.term_types)
+    logger.info("detection mode: %s", detection_mode)
+    counts = {"ok": 0, "error": 0}
+    limiter = multiprocessing.BoundedSemaphore(max(1, args.max_concurrent_detections))
+    workers = max(1, args.workers)
+    client_options = {
+        "api_url": args.api_url or os.getenv("OPENAI_API_URL", OPENAI_API_URL),
+        "max_in_flight": max(1, args.max_concurrent_detections),
+        "timeout": (5.0, args.timeout),
+        "max_retries": args.max_retries,
+        # each worker gets an equal slice of the shared budget
+        "tokens_per_minute": args.tokens_per_minute / workers if args.tokens_per_minute else None,
+    }
+    with open(manifest_path, "a" if args.resume else "w", encoding="utf-8") as manifest, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(api_key, cache_path, limiter, client_options, plan_json)) as pool:
+        futures = {
+            pool.submit(process_file, path, os.path.join(args.output_dir, name),
+                        args.sections, args.term_types, args.redact_images, detection_mode,
+                        args.chunk_chars, args.coalesce_gap, args.profile, args.page_workers,
+                        args.output_profile, memory_budget): (path, os.path.join(args.output_dir, name))
+            for path, name in pending
+        }
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                # a worker that dies (killed for memory, a crash in MuPDF) breaks the pool, and every
+                # unfinished input fails here; recording them as errors lets --resume retry them
+                path, output_path = futures[future]
+                record = {"input": path, "output": output_path, "status": "error",
+                          "error": f"{type(e).__name__}: {e}", "events": []}
+            counts[record["status"]] += 1
+            # stage events come from the worker processes; fold them into this process's registry
+            for event in record["events"]:
+                METRICS.record(event)
+                if args.log_events:
+                    events_logger.info(json.dumps(event, default=str))
+            manifest.write(json.dumps(record) + "\n")
+            manifest.flush()
+            if record["status"] == "ok":
+                logger.info("ok %s (%.2fs)", record["input"], record["timings"]["total"])
+            else:
+                logger.warning("failed %s: %s", record["input"], record["error"])
+
+    logger.info("done: %d ok, %d failed, %d skipped", counts["ok"], counts["error"], len(inputs) - len(pending))
+    if args.metrics_file:
+        with open(args.metrics_file, "w", encoding="utf-8") as fh:
+            fh.write(METRICS.render())
+    return 1 if counts["error"] else 0
@@ -0,0 +1,84 @@
+"""Compacting extracted text before it goes into a detection prompt.
+
+``get_text`` output carries a lot the model does not need: runs of spaces
+from column layouts, blank lines, ligature glyphs, soft hyphens, and on
+multi-page resumes the same running header or footer ("Jane Doe · Resume ·
+Page 2 of 3") on every page. All of it is billed as prompt tokens and adds
+latency.
+
+:func:`normalize_text` folds whitespace and ligatures and joins a line
+ending in a hyphen to the next one, keeping the hyphen. A word split by
+wrapping cannot be told from a compound name or an email broken at a line
+end ("Smith-" then "Jones"), and dropping the hyphen would turn those into
+strings that appear nowhere in the document. A term wrapped across lines
+does not match the page text ``TermMatcher`` walks either way, since that
+text keeps the line break as a space. :func:`compact_pages` also drops
+repeated header and footer lines, keeping their first occurrence: the name
+or email in a running header is still sent once, and still redacted on
+every page because matching runs over the page text, not the prompt.
+"""
+import re
+from collections import Counter
+from typing import List
+
+LIGATURES = {
+    "ﬀ": "ff",
+    "ﬁ": "fi",
+    "ﬂ": "fl",
+    "ﬃ": "ffi",
+    "ﬄ": "ffl",
+    "ﬅ": "st",
+    "ﬆ": "st",
+}
+# soft hyphens vanish; no-break, thin and other fixed-width spaces become plain spaces
+_TRANSLATE = str.maketrans({**LIGATURES, "\u00ad": "", "\u00a0": " ", "\u2009": " ", "\u202f": " ",
+                            "\t": " "})
+_SPACES = re.compile(r"[ \f\v]+")
+_HYPHEN_BREAK = re.compile(r"(?<=[^\W\d_])-\n(?=[^\W\d_])")
+_DIGITS = re.compile(r"\d+")
+
+# lines at the top and bottom of a page that are checked for running headers/footers
+EDGE_LINES = 3
+
+
+def normalize_text(text: str) -> str:
+    """Fold ligatures, whitespace runs and blank lines; join lines broken after a hyphen."""
+    text = _HYPHEN_BREAK.sub("-", text.translate(_TRANSLATE))
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _line_key(line: str, page_number: int) -> str:
+    # a running line differs between pages only in the page number: "Page 2 of 3", "3/3"
+    line = line.casefold()
+    for match in _DIGITS.finditer(line):
+        if int(match.group()) == page_number:
+            return line[:match.start()] + "#" + line[match.end():]
+    return line
+
+
+def compact_pages(pages: List[str]) -> List[str]:
+    """Normalize each page and drop running header/footer lines after their first occurrence."""
+    pages = [normalize_text(page).split("\n") if page.strip() else [] for page in pages]
+    if len(pages) < 2:
+        return ["\n".join(lines) for lines in pages]
+    edges = Counter()
+    for number, lines in enumerate(pages, 1):
+        edges.update({_line_key(line, number) for line in lines[:EDGE_LINES] + lines[-EDGE_LINES:]})
+    threshold = max(2, (len(pages) + 1) // 2)
+    running = {key for key, count in edges.items() if count >= threshold}
+    seen = set()
+    compacted = []
+    for number, lines in enumerate(pages, 1):
+        edge = set(range(min(EDGE_LINES, len(lines)))) | set(range(max(0, len(lines) - EDGE_LINES), len(lines)))
+        kept = []
+        for i, line in enumerate(lines):
+            key = _line_key(line, number)
+            if i in edge and key in running:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(line)
+        compacted.append("\n".join(kept))
+    return compacted
+
@@ -0,0 +1,137 @@
+"""Content-addressed cache for LLM detection results.
+
+Entries are keyed by a hash of the extracted resume text, the model name and
+the prompt version, so any change to one of them naturally misses. Values are
+the serialized, already validated ``ResumeData`` JSON. Lookups go through an
+in-memory LRU tier first and then an optional SQLite tier with TTL and
+size-based eviction.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+class DetectionCache:
+    def __init__(self, path: Optional[str] = None, max_memory_items: int = 128,
+                 max_disk_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 30 * 24 * 3600):
+        self.path = path
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS detections ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                    "created REAL NOT NULL, accessed REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS detections_accessed ON detections (accessed)")
+
+    @staticmethod
+    def make_key(text: str, model: str, prompt_version: str) -> str:
+        digest = hashlib.sha256()
+        for part in (model, prompt_version, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @contextmanager
+    def _connect(self) -> Iterator["sqlite3.Connection"]:
+        import sqlite3
+
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+        if self.path:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value, created FROM detections WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value, created = row
+                    if self._expired(created, now):
+                        conn.execute("DELETE FROM detections WHERE key = ?", (key,))
+                    else:
+                        conn.execute("UPDATE detections SET accessed = ? WHERE key = ?", (now, key))
+                        with self._lock:
+                            self._remember(key, value, created)
+                            self.stats["disk_hits"] += 1
+                        return value
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        if not self.path:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO detections (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            if self.ttl_seconds is not None:
+                conn.execute("DELETE FROM detections WHERE created < ?", (now - self.ttl_seconds,))
+            self._evict_disk(conn)
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _evict_disk(self, conn: "sqlite3.Connection") -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM detections").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM detections ORDER BY accessed").fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            conn.execute("DELETE FROM detections WHERE key = ?", (key,))
+            total -= size
+            with self._lock:
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM detections")
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            counters = dict(self.stats)
+        counters["hits"] = counters["memory_hits"] + counters["disk_hits"]
+        return counters
@@ -0,0 +1,224 @@
+"""Pooled, retrying chat-completions client with concurrency and rate control.
+
+One ``DetectionClient`` is meant to be shared by everything that talks to the
+detection endpoint. It keeps a pooled ``requests.Session``, applies connect
+and read timeouts, retries 429/5xx and connection failures with jittered
+exponential backoff (honouring ``Retry-After``), caps the number of requests
+in flight across every thread and event loop using it and throttles on an
+estimated token budget per minute.
+
+``post`` blocks the calling thread; ``apost`` is the asyncio variant and
+only hands the socket work to a thread, so many documents can be analyzed
+concurrently from one event loop. Both pass ``stream=True`` through to
+``requests`` for streamed completions: retries then only cover failures
+before the body starts. The session (and ``requests``) is created with the
+first request and asyncio is only imported by the async methods, so a
+client that is never used, e.g. in a local-only worker, costs nothing.
+"""
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate_per_minute``.
+
+    ``reserve`` books capacity immediately and returns how long the caller
+    must wait before using it, so blocking and async callers can share one
+    bucket and sleep in their own way.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # a single request larger than the bucket can still go through, it just waits longer
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class DetectionClient:
+    def __init__(self, api_key: str, api_url: str = "https://api.openai.com/v1/chat/completions",
+                 max_in_flight: int = 8, tokens_per_minute: Optional[float] = None,
+                 timeout: Tuple[float, float] = (5.0, 120.0), max_retries: int = 5,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_in_flight = max_in_flight
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0}
+
+    @property
+    def session(self) -> "requests.Session":
+        """The pooled HTTP session, created (and ``requests`` imported) on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update({'Content-Type': 'application/json',
+                                            'Authorization': f'Bearer {self.api_key}'})
+                    self._session = session
+        return self._session
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _send(self, payload: Dict[str, Any], **kwargs) -> "requests.Response":
+        self._count("requests")
+        return self.session.post(self.api_url, json=payload, timeout=self.timeout, **kwargs)
+
+    def _retry_delay(self, attempt: int, response: Optional["requests.Response"]) -> float:
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        # full jitter: spread retries from many clients over the whole window
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _should_retry(self, attempt: int, response: Optional["requests.Response"]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return response is None or response.status_code in RETRY_STATUSES
+
+    def _token_wait(self, payload: Dict[str, Any]) -> float:
+        if self.bucket is None:
+            return 0.0
+        wait = self.bucket.reserve(estimate_payload_tokens(payload))
+        if wait:
+            self._count("throttled_seconds", wait)
+        return wait
+
+    def _attempt(self, payload: Dict[str, Any], **kwargs):
+        """Send once under the process-wide in-flight cap; return ``(response, error)``.
+
+        Blocking and async callers both go through here, so one client never
+        has more than ``max_in_flight`` requests open, however many threads
+        and event loops share it.
+        """
+        import requests
+
+        with self._in_flight:
+            try:
+                return self._send(payload, **kwargs), None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                return None, e
+
+    def _next_delay(self, attempt: int, response: Optional["requests.Response"],
+                    error: Optional[Exception]) -> Optional[float]:
+        """Seconds to wait before retrying, or ``None`` when the attempt is final."""
+        if not self._should_retry(attempt, response):
+            return None
+        delay = self._retry_delay(attempt, response)
+        logger.warning("detection request failed (%s), retrying in %.2fs",
+                       error or response.status_code, delay)
+        if response is not None:
+            # a streamed response holds its connection until closed
+            response.close()
+        self._count("retries")
+        return delay
+
+    def _outcome(self, response: Optional["requests.Response"], error: Optional[Exception]) -> "requests.Response":
+        if error is not None:
+            self._count("failures")
+            raise error
+        if response.status_code != 200:
+            self._count("failures")
+        return response
+
+    def post(self, payload: Dict[str, Any], **kwargs) -> "requests.Response":
+        """Send ``payload``, retrying transient failures; blocks the calling thread."""
+        wait = self._token_wait(payload)
+        if wait:
+            time.sleep(wait)
+        attempt = 0
+        while True:
+            response, error = self._attempt(payload, **kwargs)
+            delay = self._next_delay(attempt, response, error)
+            if delay is None:
+                return self._outcome(response, error)
+            time.sleep(delay)
+            attempt += 1
+
+    async def apost(self, payload: Dict[str, Any], **kwargs) -> "requests.Response":
+        """Async counterpart of :meth:`post`; waits and backs off without blocking the loop.
+
+        The in-flight slot is taken on the worker thread that sends the request,
+        so waiting for one does not block the loop either.
+        """
+        import asyncio
+
+        wait = self._token_wait(payload)
+        if wait:
+            await asyncio.sleep(wait)
+        attempt = 0
+        while True:
+            response, error = await asyncio.to_thread(self._attempt, payload, **kwargs)
+            delay = self._next_delay(attempt, response, error)
+            if delay is None:
+                return self._outcome(response, error)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    import email.utils
+
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def estimate_tokens(text: str) -> int:
+    # roughly four characters per token for English text with OpenAI tokenizers
+    return max(1, len(text) // 4)
+
+
+def estimate_payload_tokens(payload: Dict[str, Any]) -> int:
+    prompt = "".join(str(m.get("content", "")) for m in payload.get("messages", []))
+    return estimate_tokens(prompt) + int(payload.get("max_tokens") or 0)
@@ -0,0 +1,140 @@
+"""Metadata-only inventory of the images placed in a PDF.
+
+Building the inventory reads only the page resources and the image stream
+dictionaries: no image is decoded. Each xref appears once, however many pages
+or placements reuse it, together with every ``(page, bbox)`` where it is
+drawn. Pixels are only touched by :class:`ThumbnailCache`, which decodes an
+image on request, shrinks it below a size cap and keeps the PNG in an LRU.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz
+
+THUMBNAIL_MAX_SIDE = 256
+
+
+class ImageInfo:
+    """One embedded image and the places it is drawn."""
+
+    def __init__(self, xref: int, width: int, height: int, bpc: int, colorspace: str,
+                 filter: str, stored_size: int):
+        self.xref = xref
+        self.width = width
+        self.height = height
+        self.bpc = bpc
+        self.colorspace = colorspace
+        self.filter = filter
+        self.stored_size = stored_size
+        self.placements: List[Tuple[int, fitz.Rect]] = []
+
+    @property
+    def page(self) -> int:
+        return self.placements[0][0] if self.placements else -1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "xref": self.xref,
+            "page": self.page,
+            "bbox": self.placements[0][1] if self.placements else None,
+            "placements": list(self.placements),
+            "width": self.width,
+            "height": self.height,
+            "bpc": self.bpc,
+            "colorspace": self.colorspace,
+            "filter": self.filter,
+            "size": self.stored_size,
+        }
+
+
+def _stream_key(doc: fitz.Document, xref: int, key: str) -> str:
+    kind, value = doc.xref_get_key(xref, key)
+    if kind == "xref":
+        # indirect value, e.g. a /Length written as "12 0 R"
+        value = doc.xref_object(int(value.split()[0]), compressed=True)
+    return value if kind != "null" else ""
+
+
+def _stored_size(doc: fitz.Document, xref: int) -> int:
+    try:
+        return int(_stream_key(doc, xref, "Length"))
+    except (ValueError, RuntimeError):
+        return 0
+
+
+class ImageInventory:
+    """Images of a document, deduplicated by xref, filled in page by page."""
+
+    def __init__(self, doc: fitz.Document):
+        self.doc = doc
+        self._images: Dict[int, ImageInfo] = {}
+        self._pages: Dict[int, List[Tuple[ImageInfo, fitz.Rect]]] = {}
+
+    def on_page(self, page_num: int) -> List[Tuple[ImageInfo, fitz.Rect]]:
+        """Return ``(image, bbox)`` for every image placement on the page."""
+        if page_num not in self._pages:
+            page = self.doc[page_num]
+            placements = []
+            # one item per resource name, so an xref drawn under two names is listed twice
+            for item in page.get_images(full=True):
+                xref = item[0]
+                info = self._images.get(xref)
+                if info is None:
+                    info = ImageInfo(
+                        xref, item[2], item[3], item[4], item[5],
+                        _stream_key(self.doc, xref, "Filter").replace("/", "").strip("[] "),
+                        _stored_size(self.doc, xref),
+                    )
+                    self._images[xref] = info
+                # get_image_rects would decode and hash the pixels; the bbox lookup by name does not
+                try:
+                    rect = page.get_image_bbox(item)
+                except Exception:
+                    continue
+                if rect.is_valid and not rect.is_empty and not rect.is_infinite:
+                    info.placements.append((page_num, rect))
+                    placements.append((info, rect))
+            self._pages[page_num] = placements
+        return self._pages[page_num]
+
+    def images(self) -> List[ImageInfo]:
+        for page_num in range(len(self.doc)):
+            self.on_page(page_num)
+        return list(self._images.values())
+
+
+class ThumbnailCache:
+    """LRU of PNG thumbnails decoded on demand, longest side at most ``max_side``."""
+
+    def __init__(self, doc: fitz.Document, max_items: int = 32, max_side: int = THUMBNAIL_MAX_SIDE):
+        self.doc = doc
+        self.max_items = max_items
+        self.max_side = max_side
+        self._items: "OrderedDict[int, Optional[bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, xref: int) -> Optional[bytes]:
+        with self._lock:
+            if xref in self._items:
+                self._items.move_to_end(xref)
+                return self._items[xref]
+            data = self._render(xref)
+            self._items[xref] = data
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+            return data
+
+    def _render(self, xref: int) -> Optional[bytes]:
+        try:
+            pix = fitz.Pixmap(self.doc, xref)
+            factor = 0
+            while max(pix.width, pix.height) >> factor > self.max_side:
+                factor += 1
+            if factor:
+                pix.shrink(factor)
+            if pix.colorspace is not None and pix.colorspace.n > 3:
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            return pix.tobytes("png")
+        except Exception:
+            return None
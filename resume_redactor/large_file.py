@@ -0,0 +1,136 @@
+"""Bounded-memory redaction for very large documents.
+
+Redacting in one pass keeps every modified page (new content streams,
+rewritten image streams) in MuPDF's memory until the final write, and the
+bytes path holds the input, the parsed copy and the output at once. For a
+scanned 100 MB+ submission that is several times the file size.
+
+The large-file mode works on a temporary copy of the file instead. It
+redacts a window of pages, appends the changes to the copy with an
+incremental save, closes the document and empties MuPDF's resource store
+before opening the copy again for the next window, so only one window's
+pages are held at a time. The final write is a full rewrite of the copy:
+it keeps only the current version of each object, so none of the
+superseded, unredacted content of earlier revisions reaches the output.
+
+Windows are sized from the memory budget and the average page size, and
+the process's resident memory is checked after each window against the
+budget. MuPDF allocates outside Python, so resident memory, not
+``tracemalloc``, is what the budget is measured in. A document that cannot
+be redacted within its budget fails with :class:`MemoryBudgetExceeded`
+instead of taking the worker down with it.
+"""
+import os
+import shutil
+import tempfile
+from typing import Dict, Optional, Union
+
+import fitz
+
+from resume_redactor.metrics import stage
+from resume_redactor.output import DEFAULT_PROFILE, Destination, write_pdf
+
+# upper bound on pages per window
+WINDOW_PAGES = 16
+# resident memory one page costs while redacted, as a multiple of its share of the file
+PAGE_MEMORY_FACTOR = 4
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """A document needed more resident memory than its budget allows."""
+
+
+def resident_bytes() -> Optional[int]:
+    """Current resident set size of this process, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryBudget:
+    """Resident memory growth allowed over the level at construction."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.baseline = resident_bytes()
+        self.peak = 0
+
+    def used(self) -> Optional[int]:
+        current = resident_bytes()
+        if current is None or self.baseline is None:
+            return None
+        used = max(0, current - self.baseline)
+        self.peak = max(self.peak, used)
+        return used
+
+    def check(self, where: str) -> None:
+        used = self.used()
+        if used is not None and used > self.limit:
+            raise MemoryBudgetExceeded(
+                f"{where}: {used / 1e6:.0f} MB resident over budget of {self.limit / 1e6:.0f} MB")
+
+
+def window_size(size: int, page_count: int, budget: int) -> int:
+    """Pages per window so that a window's expected footprint fits in half the budget."""
+    per_page = max(1, size // max(1, page_count)) * PAGE_MEMORY_FACTOR
+    return max(1, min(WINDOW_PAGES, budget // 2 // per_page))
+
+
+def _open_work(path: str) -> fitz.Document:
+    doc = fitz.open(path, filetype="pdf")
+    if doc.can_save_incrementally():
+        return doc
+    # a repaired file cannot take incremental updates: rewrite it once first
+    repaired = path + ".full"
+    doc.save(repaired)
+    doc.close()
+    os.replace(repaired, path)
+    return fitz.open(path, filetype="pdf")
+
+
+def redact_windowed(session, plan, redact_images: bool, stats: Dict[str, int], coalesce_gap: float,
+                    memory_budget: int, output: Destination = None,
+                    profile: str = DEFAULT_PROFILE) -> Union[bytes, int]:
+    """Redact ``session``'s document one page window at a time within ``memory_budget`` bytes."""
+    from resume_redactor.redactor import PDFRedactor
+
+    page_count = session.page_count
+    stats["pages"] = page_count
+    matcher = plan.matcher
+    budget = MemoryBudget(memory_budget)
+    window = window_size(session.size, page_count, memory_budget)
+    with tempfile.TemporaryDirectory(prefix="redact-") as tmp, \
+            stage("redact", terms=len(matcher), bytes_in=session.size, pages=page_count,
+                  window=window, memory_budget=memory_budget) as event:
+        work = os.path.join(tmp, "work.pdf")
+        if session.path is not None:
+            shutil.copyfile(session.path, work)
+        else:
+            with open(work, "wb") as fh:
+                fh.write(session.pdf_bytes)
+        doc = _open_work(work)
+        hits = 0
+        try:
+            for start in range(0, page_count, window):
+                pages = range(start, min(start + window, page_count))
+                hits += PDFRedactor.redact_pages(session, doc, pages, matcher, redact_images, stats,
+                                                 coalesce_gap)
+                doc.saveIncr()
+                doc.close()
+                doc = None
+                session.release(pages)
+                fitz.TOOLS.store_shrink(100)
+                budget.check(f"pages {pages.start + 1}-{pages.stop}")
+                doc = fitz.open(work, filetype="pdf")
+            event.update(hits=hits, annotations=stats["text_redactions"] + stats["image_redactions"])
+            data = write_pdf(doc, output, profile, session.size)
+        finally:
+            # None when the budget check between windows failed
+            if doc is not None:
+                doc.close()
+        budget.check("write")
+        event["peak_resident_bytes"] = budget.peak
+        event["bytes_out"] = data if output is not None else len(data)
+        return data
@@ -0,0 +1,92 @@
+"""Offline detection of the resume fields that follow a fixed shape.
+
+Emails, phone numbers, profile/other URLs and years can be found with
+precompiled patterns in microseconds, so they never need a model call. Phone
+and email candidates are confirmed with ``PDFRedactor.determine_term_type`` so
+the local tier agrees with how those terms are later expanded for matching.
+"""
+import re
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from resume_redactor.models import ResumeData
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+URL_RE = re.compile(
+    r"(?:https?://|www\.)[^\s<>()\"']+"
+    r"|\b(?:[a-z]{2,3}\.)?(?:linkedin\.com|github\.com)/[^\s<>()\"']+",
+    re.IGNORECASE,
+)
+PHONE_RE = re.compile(r"(?<![\w.])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)[\s.-]?|\d{2,4}[\s.-])\d{3,4}[\s.-]?\d{3,4}(?![\w])")
+YEAR_RE = re.compile(r"\b(?:19[5-9]\d|20\d{2})\b")
+
+# (section, field) pairs the local tier fills on its own
+LOCAL_FIELDS: Dict[str, List[str]] = {
+    "personal_info": ["emails", "phone_numbers", "linkedin_urls", "github_urls", "other_urls"],
+    "education": ["graduation_years"],
+}
+# term types (as returned by determine_term_type) that LOCAL_FIELDS can produce
+LOCAL_TERM_TYPES = {"email", "phone", "url", "year"}
+
+
+def covers(term_types: List[str]) -> bool:
+    """True when every requested term type can be produced without the model."""
+    return bool(term_types) and set(term_types) <= LOCAL_TERM_TYPES
+
+
+def _unique(items: List[str]) -> List[str]:
+    seen = set()
+    result = []
+    for item in items:
+        key = item.lower()
+        if key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+def detect_local(text: str) -> "ResumeData":
+    from resume_redactor.models import ResumeData
+    # imported here to avoid a cycle: redactor imports this module
+    from resume_redactor.redactor import PDFRedactor
+
+    emails = [m for m in EMAIL_RE.findall(text)
+              if PDFRedactor.determine_term_type(m, "personal_info") == "email"]
+    phones = []
+    for match in PHONE_RE.findall(text):
+        candidate = match.strip()
+        digits = sum(c.isdigit() for c in candidate)
+        if 7 <= digits <= 15 and PDFRedactor.determine_term_type(candidate, "personal_info") == "phone":
+            phones.append(candidate)
+    linkedin, github, other = [], [], []
+    for match in URL_RE.findall(text):
+        url = match.rstrip(".,;:")
+        lowered = url.lower()
+        if "linkedin.com" in lowered:
+            linkedin.append(url)
+        elif "github.com" in lowered:
+            github.append(url)
+        else:
+            other.append(url)
+    years = sorted(set(YEAR_RE.findall(text)))
+    return ResumeData.model_validate({
+        "personal_info": {
+            "emails": _unique(emails),
+            "phone_numbers": _unique(phones),
+            "linkedin_urls": _unique(linkedin),
+            "github_urls": _unique(github),
+            "other_urls": _unique(other),
+        },
+        "education": {"graduation_years": years},
+    })
+
+
+def merge_local(remote: "ResumeData", local: "ResumeData") -> "ResumeData":
+    """Overlay the locally detected fields onto a model result."""
+    merged = remote.model_copy(deep=True)
+    for section, fields in LOCAL_FIELDS.items():
+        target = getattr(merged, section)
+        source = getattr(local, section)
+        for field in fields:
+            setattr(target, field, list(getattr(source, field)))
+    return merged
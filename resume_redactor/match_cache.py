@@ -0,0 +1,223 @@
+"""Incremental re-redaction for iterative review of one document.
+
+Reviewing a resume means redacting it many times with slightly different
+selections. Redacting from scratch searches every page for every term and
+re-applies every page's redactions, although one added or removed item
+usually changes the hits on a page or two.
+
+A :class:`MatchCache` remembers, per ``(document digest, page, canonical
+term)``, where the term occurs on the page: its character spans in the
+page text and their rects. A new plan only searches the pages for the terms
+not seen before, in one Aho-Corasick pass over the missing terms, and
+assembles each page's hits from the cache. It also keeps the last output
+per document together with each page's final redaction boxes. Pages whose
+boxes did not change are taken as they are from that output; only the
+others are copied back from the original and redacted again. Unchanged
+selections return the previous output without touching the document.
+
+The result is the same document the serial path produces: the same hits
+(contained hits are dropped across the whole term set, as the plan's
+matcher does), merged the same way, applied to the same original pages.
+Swapping a page in breaks whatever refers to it from elsewhere in the
+document (outline entries, links, form fields), so documents that have any
+of these are always redacted afresh; only their term hits are reused.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+import fitz
+
+from resume_redactor.matching import TermMatcher, normalize_term
+from resume_redactor.metrics import stage
+from resume_redactor.output import DEFAULT_PROFILE, Destination, write_pdf
+
+# cached (page, term) entries across all documents
+MAX_ENTRIES = 200_000
+# documents whose last output is kept for reuse
+MAX_RENDERS = 8
+
+Span = Tuple[int, int, Tuple[Tuple[float, float, float, float], ...]]
+Boxes = Tuple[Tuple[float, float, float, float], ...]
+
+
+class _Render:
+    """The last output for one document and the redaction boxes of each of its pages."""
+
+    def __init__(self, pages: List[Tuple[Boxes, bool]], data: bytes, profile: str, references: bool):
+        self.pages = pages
+        self.data = data
+        self.profile = profile
+        # whether the document has an outline, links or form fields
+        self.references = references
+
+
+class MatchCache:
+    """Page-level term hits and last outputs, shared by every redaction of the same documents."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_renders: int = MAX_RENDERS):
+        self.max_entries = max_entries
+        self.max_renders = max_renders
+        self._hits: "OrderedDict[Tuple[str, int, str], List[Span]]" = OrderedDict()
+        self._renders: "OrderedDict[str, _Render]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"term_hits": 0, "term_misses": 0, "pages_reused": 0, "pages_rebuilt": 0}
+
+    def lookup(self, digest: str, page_num: int, keys: List[str]) -> Tuple[Dict[str, List[Span]], List[str]]:
+        """Return the cached spans of ``keys`` on a page and the keys that are not cached."""
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                spans = self._hits.get((digest, page_num, key))
+                if spans is None:
+                    missing.append(key)
+                else:
+                    self._hits.move_to_end((digest, page_num, key))
+                    found[key] = spans
+            self.stats["term_hits"] += len(found)
+            self.stats["term_misses"] += len(missing)
+        return found, missing
+
+    def store(self, digest: str, page_num: int, spans: Dict[str, List[Span]]) -> None:
+        with self._lock:
+            for key, value in spans.items():
+                self._hits[(digest, page_num, key)] = value
+            while len(self._hits) > self.max_entries:
+                self._hits.popitem(last=False)
+
+    def render(self, digest: str) -> Optional[_Render]:
+        with self._lock:
+            render = self._renders.get(digest)
+            if render is not None:
+                self._renders.move_to_end(digest)
+            return render
+
+    def store_render(self, digest: str, render: _Render) -> None:
+        with self._lock:
+            self._renders[digest] = render
+            self._renders.move_to_end(digest)
+            while len(self._renders) > self.max_renders:
+                self._renders.popitem(last=False)
+
+    def count(self, key: str, amount: int) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hits.clear()
+            self._renders.clear()
+
+
+def _page_hits(cache: MatchCache, session, page_num: int, terms: Dict[str, str],
+               matchers: Dict[frozenset, TermMatcher]) -> Tuple[List[Tuple[int, int, int]], Dict, List[str]]:
+    """All hits of ``terms`` on a page as ``(start, end, term_index)``, searching only uncached terms."""
+    digest = session.digest
+    keys = list(terms)
+    found, missing = cache.lookup(digest, page_num, keys)
+    if missing:
+        group = frozenset(missing)
+        matcher = matchers.get(group)
+        if matcher is None:
+            matcher = matchers[group] = TermMatcher(terms[key] for key in missing)
+        page_text = session.page_words(page_num)
+        new = {key: [] for key in missing}
+        for start, end, term_index in matcher.find_all(page_text.text):
+            rects = tuple(tuple(rect) for rect in page_text.span_rects(start, end))
+            new[normalize_term(matcher.terms[term_index])].append((start, end, rects))
+        cache.store(digest, page_num, new)
+        found.update(new)
+    index = {key: i for i, key in enumerate(keys)}
+    hits = [(start, end, index[key]) for key, spans in found.items() for start, end, _ in spans]
+    rects = {(start, end): span_rects for spans in found.values() for start, end, span_rects in spans}
+    return hits, rects, missing
+
+
+def redact_incremental(session, plan, redact_images: bool, stats: Dict[str, int], coalesce_gap: float,
+                       cache: MatchCache, output: Destination = None,
+                       profile: str = DEFAULT_PROFILE, workers: int = 1) -> Union[bytes, int]:
+    """Redact ``session``'s document reusing ``cache``'s term hits and its last output.
+
+    When every page has to be redacted and the document is long enough, the
+    pages are redacted across ``workers`` processes (see ``parallel.py``).
+    """
+    from resume_redactor.parallel import PARALLEL_MIN_PAGES, has_references, redact_ranges
+    from resume_redactor.redactor import PDFRedactor
+
+    page_count = session.page_count
+    stats["pages"] = page_count
+    matcher = plan.matcher
+    terms = {normalize_term(term): term for term in matcher.terms}
+    with stage("redact", terms=len(terms), bytes_in=session.size, pages=page_count) as event:
+        matchers: Dict[frozenset, TermMatcher] = {}
+        searched = set()
+        hits = 0
+        page_rects: Dict[int, List[fitz.Rect]] = {}
+        pages: List[Tuple[Boxes, bool]] = []
+        for page_num in range(page_count):
+            page_hits, span_rects, missing = _page_hits(cache, session, page_num, terms, matchers)
+            searched.update(missing)
+            if matcher.drop_contained:
+                page_hits = TermMatcher._outermost(page_hits)
+            rects = [fitz.Rect(rect) + (-0.5, -0.5, 0.5, 0.5)
+                     for start, end, _ in page_hits for rect in span_rects[(start, end)]]
+            hits += len(rects)
+            page_rects[page_num] = rects
+            boxes = tuple(tuple(rect) for rect in PDFRedactor.merge_overlapping_rects(rects, coalesce_gap))
+            pages.append((boxes, redact_images))
+
+        previous = cache.render(session.digest)
+        references = previous.references if previous is not None else has_references(session.doc)
+        if previous is not None and len(previous.pages) == page_count:
+            changed = [n for n in range(page_count) if previous.pages[n] != pages[n]]
+        else:
+            previous, changed = None, list(range(page_count))
+        if previous is not None and changed and (references or len(changed) > page_count // 2):
+            # swapped pages would lose what refers to them, and copying most pages back
+            # costs more than redacting the original afresh
+            previous, changed = None, list(range(page_count))
+        cache.count("pages_reused", page_count - len(changed))
+        cache.count("pages_rebuilt", len(changed))
+        event.update(hits=hits, searched_terms=len(searched), pages_rebuilt=len(changed))
+        stats["text_redactions"] = sum(len(boxes) for boxes, _ in pages)
+        stats["image_redactions"] = (sum(len(session.images.on_page(n)) for n in range(page_count))
+                                     if redact_images else 0)
+        event["annotations"] = stats["text_redactions"] + stats["image_redactions"]
+
+        if previous is not None and not changed and previous.profile == profile:
+            data = previous.data
+        else:
+            scratch = {"text_redactions": 0, "image_redactions": 0}
+            # stitched page ranges keep the outline but not links or form fields
+            if previous is None and workers > 1 and page_count >= PARALLEL_MIN_PAGES and not references:
+                doc, _ = redact_ranges(session, plan, redact_images, scratch, coalesce_gap, workers)
+                try:
+                    data = write_pdf(doc, None, profile, session.size)
+                finally:
+                    doc.close()
+            elif previous is None:
+                with session.edit() as doc:
+                    PDFRedactor.redact_pages(session, doc, range(page_count), matcher, redact_images, scratch,
+                                             coalesce_gap, page_rects)
+                    data = write_pdf(doc, None, profile, session.size)
+            else:
+                with fitz.open(stream=previous.data, filetype="pdf") as doc:
+                    for page_num in changed:
+                        # swap the previously redacted page for the original one: redacting on top of
+                        # earlier redactions is not the same, their fills count as line art
+                        doc.insert_pdf(session.doc, from_page=page_num, to_page=page_num, start_at=page_num)
+                        doc.delete_page(page_num + 1)
+                    PDFRedactor.redact_pages(session, doc, changed, matcher, redact_images, scratch,
+                                             coalesce_gap, page_rects)
+                    data = write_pdf(doc, None, profile, session.size)
+            cache.store_render(session.digest, _Render(pages, data, profile, references))
+        if output is None:
+            event["bytes_out"] = len(data)
+            return data
+        if hasattr(output, "write"):
+            output.write(data)
+        else:
+            with open(output, "wb") as fh:
+                fh.write(data)
+        event["bytes_out"] = len(data)
+        return len(data)
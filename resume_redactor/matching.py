@@ -0,0 +1,186 @@
+"""Single-pass multi-term matching over PDF page text.
+
+`page.search_for(term)` rescans the page once per term. `TermMatcher` builds an
+Aho-Corasick automaton over the whole term set and walks each page's text once,
+mapping every hit back to character geometry pulled from a single
+``get_text("rawdict")`` call.
+"""
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import fitz
+
+
+def normalize_term(text: str) -> str:
+    # search_for is case-insensitive and treats any whitespace run as one space
+    return " ".join(text.split()).lower()
+
+
+class PageText:
+    """Normalized text of one page with a bbox and line id for every character."""
+
+    def __init__(self, text: str, rects: List[Optional[Tuple[float, float, float, float]]],
+                 line_ids: List[int]):
+        self.text = text
+        self.rects = rects
+        self.line_ids = line_ids
+
+    @classmethod
+    def from_page(cls, page) -> "PageText":
+        import fitz
+
+        chars = []
+        rects = []
+        line_ids = []
+        line_no = 0
+        raw = page.get_text("rawdict", flags=fitz.TEXTFLAGS_SEARCH)
+        for block in raw.get("blocks", []):
+            if block.get("type", 0) != 0:
+                continue
+            for line in block.get("lines", []):
+                if chars and chars[-1] != " ":
+                    chars.append(" ")
+                    rects.append(None)
+                    line_ids.append(-1)
+                for span in line.get("spans", []):
+                    for ch in span.get("chars", []):
+                        c = ch["c"]
+                        if c.isspace():
+                            if chars and chars[-1] != " ":
+                                chars.append(" ")
+                                rects.append(None)
+                                line_ids.append(-1)
+                            continue
+                        bbox = ch["bbox"]
+                        # keep a 1:1 mapping even when lowercasing expands a char
+                        for lc in c.lower():
+                            chars.append(lc)
+                            rects.append(bbox)
+                            line_ids.append(line_no)
+                line_no += 1
+        return cls("".join(chars), rects, line_ids)
+
+    def span_rects(self, start: int, end: int) -> List["fitz.Rect"]:
+        """Return one rect per text line covered by the character span."""
+        import fitz
+
+        rects = []
+        current_line = None
+        x0 = y0 = x1 = y1 = 0.0
+        for i in range(start, end):
+            bbox = self.rects[i]
+            if bbox is None:
+                continue
+            line_id = self.line_ids[i]
+            if line_id != current_line:
+                if current_line is not None:
+                    rects.append(fitz.Rect(x0, y0, x1, y1))
+                current_line = line_id
+                x0, y0, x1, y1 = bbox
+            else:
+                x0 = min(x0, bbox[0])
+                y0 = min(y0, bbox[1])
+                x1 = max(x1, bbox[2])
+                y1 = max(y1, bbox[3])
+        if current_line is not None:
+            rects.append(fitz.Rect(x0, y0, x1, y1))
+        return rects
+
+
+class TermMatcher:
+    """Aho-Corasick automaton over a normalized set of search terms.
+
+    With ``drop_contained`` a hit lying entirely within a longer hit is not
+    reported, since its rects are covered by the longer hit's rects anyway.
+    """
+
+    def __init__(self, terms: Iterable[str], drop_contained: bool = False):
+        self.drop_contained = drop_contained
+        self.terms: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        seen = set()
+        for term in terms:
+            key = normalize_term(term)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            node = 0
+            for c in key:
+                nxt = self._goto[node].get(c)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][c] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(len(self.terms))
+            self.terms.append(term)
+        self._lengths = [len(normalize_term(t)) for t in self.terms]
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(c, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """Return ``(start, end, term_index)`` for every occurrence in ``text``."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        lengths = self._lengths
+        hits = []
+        node = 0
+        for i, c in enumerate(text):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            if out[node]:
+                for term_index in out[node]:
+                    hits.append((i + 1 - lengths[term_index], i + 1, term_index))
+        return hits
+
+    @staticmethod
+    def _outermost(hits: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        kept = []
+        reach = -1
+        for hit in sorted(hits, key=lambda h: (h[0], -h[1])):
+            if hit[1] > reach:
+                kept.append(hit)
+                reach = hit[1]
+        return kept
+
+    def search_page(self, page, page_text: Optional[PageText] = None) -> List[Tuple[str, "fitz.Rect"]]:
+        """Return ``(term, rect)`` for every hit on ``page`` in a single text pass.
+
+        ``page_text`` may be passed in when the caller already holds the page's
+        geometry, e.g. from a ``RedactionSession``.
+        """
+        if not self.terms:
+            return []
+        if page_text is None:
+            page_text = PageText.from_page(page)
+        hits = self.find_all(page_text.text)
+        if self.drop_contained:
+            hits = self._outermost(hits)
+        results = []
+        for start, end, term_index in hits:
+            term = self.terms[term_index]
+            for rect in page_text.span_rects(start, end):
+                results.append((term, rect))
+        return results
@@ -0,0 +1,249 @@
+"""Per-stage instrumentation for the redaction pipeline.
+
+Each pipeline stage (parse, extract, detect, images, match, annotate, apply,
+write, redact) is wrapped in :func:`stage`, which measures wall time and
+attaches counts such as pages, terms, hits, annotations, bytes and token
+usage to an event. Every event is
+
+* logged as one JSON line on the ``resume_redactor.metrics`` logger (DEBUG),
+* folded into a process-wide :class:`Metrics` registry that renders an
+  OpenMetrics/Prometheus text snapshot, and
+* appended to the list of any enclosing :func:`collect` block, which is how
+  CLI workers ship their events back to the parent process.
+
+:func:`profiled` wraps a single request in cProfile or tracemalloc.
+"""
+import contextvars
+import io
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "resume_redactor"
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+# numeric event fields that are accumulated as counters
+COUNTED = {
+    "pages": "Pages processed.",
+    "terms": "Distinct search terms.",
+    "hits": "Term matches found.",
+    "annotations": "Redaction annotations created.",
+    "images": "Images found.",
+    "bytes_in": "Input bytes.",
+    "bytes_out": "Output bytes.",
+    "chars": "Characters of text handled.",
+    "prompt_tokens": "LLM prompt tokens.",
+    "completion_tokens": "LLM completion tokens.",
+    "total_tokens": "LLM tokens.",
+    "prompt_tokens_raw": "Estimated prompt tokens before compaction.",
+    "prompt_tokens_compact": "Estimated prompt tokens sent after compaction.",
+}
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+_collector: "contextvars.ContextVar[Optional[List[Dict[str, Any]]]]" = contextvars.ContextVar(
+    "resume_redactor_events", default=None)
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """Thread-safe counters and per-stage latency histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, List[float]] = {}
+        self._sums: Dict[str, float] = {}
+        self._counters: Dict[Tuple[str, str], float] = {}
+        self._errors: Dict[str, int] = {}
+
+    def record(self, event: Dict[str, Any]) -> None:
+        name = event["stage"]
+        seconds = event.get("seconds", 0.0)
+        with self._lock:
+            counts = self._histograms.setdefault(name, [0] * len(BUCKETS))
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    counts[i] += 1
+            self._sums[name] = self._sums.get(name, 0.0) + seconds
+            for field in COUNTED:
+                value = event.get(field)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self._counters[(field, name)] = self._counters.get((field, name), 0) + value
+            if event.get("error"):
+                self._errors[name] = self._errors.get(name, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._sums.clear()
+            self._counters.clear()
+            self._errors.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": {name: {"count": counts[-1], "seconds": self._sums[name]}
+                           for name, counts in self._histograms.items()},
+                "counters": {f"{field}{{stage={name}}}": value
+                             for (field, name), value in self._counters.items()},
+                "errors": dict(self._errors),
+            }
+
+    def render(self) -> str:
+        """Return the registry in the OpenMetrics text format."""
+        lines = []
+        with self._lock:
+            family = f"{PREFIX}_stage_seconds"
+            lines.append(f"# TYPE {family} histogram")
+            lines.append(f"# HELP {family} Wall time per pipeline stage.")
+            lines.append(f"# UNIT {family} seconds")
+            for name in sorted(self._histograms):
+                label = _label_value(name)
+                for bound, count in zip(BUCKETS, self._histograms[name]):
+                    lines.append(f'{family}_bucket{{stage="{label}",le="{_format(bound)}"}} {count}')
+                lines.append(f'{family}_count{{stage="{label}"}} {self._histograms[name][-1]}')
+                lines.append(f'{family}_sum{{stage="{label}"}} {_format(self._sums[name])}')
+            family = f"{PREFIX}_stage_errors"
+            lines.append(f"# TYPE {family} counter")
+            lines.append(f"# HELP {family} Stages that raised.")
+            for name in sorted(self._errors):
+                lines.append(f'{family}_total{{stage="{_label_value(name)}"}} {self._errors[name]}')
+            for field, help_text in COUNTED.items():
+                samples = sorted((name, value) for (f, name), value in self._counters.items() if f == field)
+                if not samples:
+                    continue
+                family = f"{PREFIX}_{field}"
+                lines.append(f"# TYPE {family} counter")
+                lines.append(f"# HELP {family} {help_text}")
+                for name, value in samples:
+                    lines.append(f'{family}_total{{stage="{_label_value(name)}"}} {_format(value)}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+def emit(name: str, seconds: float, registry: Metrics = None, **fields) -> Dict[str, Any]:
+    """Record a finished stage: log it, count it and hand it to any active collector."""
+    event = {"stage": name, "seconds": round(seconds, 6), **fields}
+    (registry or METRICS).record(event)
+    events = _collector.get()
+    if events is not None:
+        events.append(event)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(json.dumps(event, default=str))
+    return event
+
+
+def forward(event: Dict[str, Any], registry: Metrics = None) -> None:
+    """Count an event emitted in another process and hand it to any active collector."""
+    (registry or METRICS).record(event)
+    events = _collector.get()
+    if events is not None:
+        events.append(event)
+
+
+@contextmanager
+def stage(name: str, finish: Callable[[], Dict[str, Any]] = None, **fields) -> Iterator[Dict[str, Any]]:
+    """Time the enclosed block as stage ``name``.
+
+    The yielded dict collects the event's fields; ``finish`` is called on exit
+    and its result merged in, which suits values only known after a method
+    with several return points has returned.
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as e:
+        fields["error"] = type(e).__name__
+        raise
+    finally:
+        if finish is not None:
+            try:
+                fields.update(finish())
+            except Exception:
+                logger.exception("metrics finish hook for %s failed", name)
+        emit(name, time.perf_counter() - start, **fields)
+
+
+@contextmanager
+def collect() -> Iterator[List[Dict[str, Any]]]:
+    """Collect the events emitted in this context (including tasks and threads it spawns)."""
+    events: List[Dict[str, Any]] = []
+    token = _collector.set(events)
+    try:
+        yield events
+    finally:
+        _collector.reset(token)
+
+
+@contextmanager
+def profiled(mode: Optional[str], top: int = 15, dump_path: str = None) -> Iterator[Dict[str, Any]]:
+    """Capture a cProfile or tracemalloc report for the enclosed block.
+
+    ``mode`` is ``None`` (no capture), ``"cprofile"`` or ``"tracemalloc"``. The
+    yielded dict is filled on exit: ``report`` holds the ``top`` entries as
+    text and, for tracemalloc, ``peak_bytes`` the traced peak. cProfile stats
+    are also written to ``dump_path`` when given.
+    """
+    capture: Dict[str, Any] = {"mode": mode}
+    if mode is None:
+        yield capture
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"unknown profile mode: {mode}")
+    if mode == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # another profiler is already active on this thread
+            capture["error"] = str(e)
+            yield capture
+            return
+        try:
+            yield capture
+        finally:
+            profiler.disable()
+            out = io.StringIO()
+            stats = pstats.Stats(profiler, stream=out)
+            stats.sort_stats("cumulative").print_stats(top)
+            capture["report"] = out.getvalue()
+            if dump_path:
+                try:
+                    stats.dump_stats(dump_path)
+                    capture["path"] = dump_path
+                except OSError as e:
+                    capture["error"] = str(e)
+        return
+    import tracemalloc
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        yield capture
+    finally:
+        capture["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot()
+        if started:
+            tracemalloc.stop()
+        capture["report"] = "\n".join(str(stat) for stat in snapshot.statistics("lineno")[:top])
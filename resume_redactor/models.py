@@ -0,0 +1,38 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+
+class PersonalInfo(BaseModel):
+    emails: List[str] = []
+    phone_numbers: List[str] = []
+    names: List[str] = []
+    addresses: List[str] = []
+    linkedin_urls: List[str] = []
+    github_urls: List[str] = []
+    other_urls: List[str] = []
+    locations: List[str] = []
+
+
+class EducationInfo(BaseModel):
+    institutions: List[str] = []
+    degrees: List[str] = []
+    graduation_years: List[str] = []
+    gpa_scores: List[str] = []
+    certifications: List[str] = []
+
+
+class ExperienceInfo(BaseModel):
+    companies: List[str] = []
+    job_titles: List[str] = []
+    project_titles: List[str] = []
+    employment_dates: List[str] = []
+    achievements: List[str] = []
+    responsibilities: List[str] = []
+
+
+class ResumeData(BaseModel):
+    personal_info: PersonalInfo = PersonalInfo()
+    education: EducationInfo = EducationInfo()
+    experience: ExperienceInfo = ExperienceInfo()
@@ -0,0 +1,135 @@
+"""Page-parallel redaction for long documents.
+
+The page loop of ``PDFRedactor.apply_plan`` is independent per page, so long
+documents are cut into contiguous page ranges. Each range is redacted in a
+worker process that opens the document itself, runs the same
+``PDFRedactor.redact_pages`` routine, keeps only its own pages and returns
+them as a small PDF. The parent stitches the parts back together in order,
+so every page gets exactly the redactions the serial path would give it.
+
+Starting processes and re-parsing the document in each worker costs more
+than it saves on short documents, which therefore stay serial (see
+``PARALLEL_MIN_PAGES``). So do documents with an outline, links or form
+fields: each worker keeps only its own pages, which drops links into other
+ranges, and widgets do not survive the stitching (see ``has_references``).
+
+Each call starts and shuts down its own pool, so it is safe to call from
+inside a CLI worker process. Its workers are spawned rather than forked by
+default, since callers such as the Streamlit app and the HTTP service run
+threads, and forking a threaded process is unsafe. A document opened from
+memory is written to a temporary file once, which the workers open by path,
+instead of being pickled into every task.
+"""
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Union
+
+from resume_redactor.metrics import collect, forward, stage
+from resume_redactor.output import DEFAULT_PROFILE, Destination, write_pdf
+
+# below this many pages the serial loop wins
+PARALLEL_MIN_PAGES = 24
+# smallest page range worth shipping to a worker
+MIN_RANGE_PAGES = 4
+# substage events forwarded from the workers to the parent's metrics
+FORWARDED_STAGES = ("match", "annotate", "apply")
+
+def has_references(doc) -> bool:
+    """Whether anything in ``doc`` points at its pages: an outline, links or form fields."""
+    return bool(doc.get_toc()) or bool(doc.is_form_pdf) or any(page.first_link for page in doc)
+
+
+def page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """Split pages into contiguous ranges, about two per worker for load balance."""
+    parts = max(1, min(workers * 2, page_count // MIN_RANGE_PAGES))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _redact_range(path: str, plan_json: str, start: int, stop: int, redact_images: bool,
+                  coalesce_gap: float):
+    from resume_redactor.plan import RedactionPlan
+    from resume_redactor.redactor import PDFRedactor
+    from resume_redactor.session import RedactionSession
+
+    plan = RedactionPlan.from_json(plan_json)
+    stats = {"text_redactions": 0, "image_redactions": 0}
+    with collect() as events, RedactionSession(path) as session, session.edit() as doc:
+        hits = PDFRedactor.redact_pages(session, doc, range(start, stop), plan.matcher, redact_images,
+                                        stats, coalesce_gap)
+        doc.select(list(range(start, stop)))
+        data = doc.write(garbage=1)
+    return data, stats, hits, [e for e in events if e["stage"] in FORWARDED_STAGES]
+
+
+def redact_ranges(session, plan, redact_images: bool, stats: Dict[str, int], coalesce_gap: float,
+                  workers: int, mp_context=None):
+    """Redact ``session``'s pages across ``workers`` processes; return the stitched document and the hit count.
+
+    The workers are spawned unless ``mp_context`` says otherwise. The caller
+    closes the returned document.
+    """
+    import fitz
+
+    plan_json = plan.to_json()
+    ranges = page_ranges(session.page_count, workers)
+    spool = None
+    if session.path is None:
+        with tempfile.NamedTemporaryFile(prefix="redact-", suffix=".pdf", delete=False) as fh:
+            fh.write(session.pdf_bytes)
+        spool = fh.name
+    path = session.path or spool
+    hits = 0
+    out = fitz.open()
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges)),
+                                 mp_context=mp_context or multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_redact_range, path, plan_json, start, stop, redact_images,
+                                   coalesce_gap)
+                       for start, stop in ranges]
+            for future in futures:
+                data, part_stats, part_hits, events = future.result()
+                hits += part_hits
+                for key, value in part_stats.items():
+                    stats[key] += value
+                for forwarded in events:
+                    forward(forwarded)
+                with fitz.open(stream=data, filetype="pdf") as part:
+                    out.insert_pdf(part)
+        out.set_metadata(session.doc.metadata)
+    except BaseException:
+        out.close()
+        raise
+    finally:
+        if spool is not None:
+            os.remove(spool)
+    return out, hits
+
+
+def redact_parallel(session, plan, redact_images: bool, stats: Dict[str, int], coalesce_gap: float,
+                    workers: int, output: Destination = None,
+                    profile: str = DEFAULT_PROFILE) -> Union[bytes, int]:
+    """Redact ``session``'s document across ``workers`` processes and stitch the result.
+
+    The stitched document is written like ``PDFRedactor.apply_plan`` writes it.
+    """
+    page_count = session.page_count
+    stats["pages"] = page_count
+    with stage("redact", terms=len(plan), bytes_in=session.size, pages=page_count,
+               workers=workers) as event:
+        out, hits = redact_ranges(session, plan, redact_images, stats, coalesce_gap, workers)
+        event.update(hits=hits, annotations=stats["text_redactions"] + stats["image_redactions"])
+        try:
+            data = write_pdf(out, output, profile, session.size)
+        finally:
+            out.close()
+        event["bytes_out"] = data if output is not None else len(data)
+        return data
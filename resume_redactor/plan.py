@@ -0,0 +1,179 @@
+"""Compiled, reusable set of search terms for redaction.
+
+``generate_smart_search_terms`` emits lower/upper/title-case variants of
+every item, but matching is case-insensitive, so those variants are the same
+search. A ``RedactionPlan`` compiles detected items (or a plain deny list)
+once: each term is canonicalized the way the matcher normalizes text, kept
+once per canonical form, and remembers which ``(section, item)`` pairs
+produced it. Plans serialize to JSON, so one plan, such as a company-wide
+deny list, can be stored and applied to many documents without being
+regenerated.
+
+Terms that only occur inside a longer term are not removed from the plan,
+since they still have to match on their own elsewhere. Instead the plan's
+matcher drops any hit lying entirely within a longer hit, which adds
+nothing once the rects are merged.
+"""
+import json
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from resume_redactor.matching import TermMatcher, normalize_term
+
+if TYPE_CHECKING:
+    from resume_redactor.models import ResumeData
+
+PLAN_VERSION = 1
+# term type used to generate variants for each detected field
+FIELD_TERM_TYPES = {
+    "personal_info": {
+        "emails": "email", "phone_numbers": "phone", "names": "name", "addresses": "general",
+        "linkedin_urls": "url", "github_urls": "url", "other_urls": "url", "locations": "general",
+    },
+    "education": {
+        "institutions": "institution", "degrees": "degree", "graduation_years": "year",
+        "gpa_scores": "general", "certifications": "general",
+    },
+    "experience": {
+        "companies": "company", "job_titles": "general", "project_titles": "project",
+        "employment_dates": "date", "achievements": "general", "responsibilities": "general",
+    },
+}
+
+Source = Tuple[str, str]
+
+
+class PlanTerm:
+    """One canonical search term and the items it was generated from."""
+
+    def __init__(self, term: str, term_type: str, sources: List[Source] = None):
+        self.term = term
+        self.key = normalize_term(term)
+        self.term_type = term_type
+        self.sources: List[Source] = sources or []
+
+    def to_dict(self) -> Dict:
+        return {"term": self.term, "type": self.term_type, "sources": [list(s) for s in self.sources]}
+
+
+class RedactionPlan:
+    """Deduplicated search terms with provenance, compiled once and applied many times."""
+
+    def __init__(self, terms: Iterable[PlanTerm] = ()):
+        self._terms: Dict[str, PlanTerm] = {}
+        self.generated = 0
+        self._matcher: Optional[TermMatcher] = None
+        for term in terms:
+            self._add(term.term, term.term_type, term.sources)
+
+    def _add(self, term: str, term_type: str, sources: List[Source]) -> None:
+        # the same short-term filter the redaction loop applies to every hit
+        from resume_redactor.redactor import PDFRedactor
+
+        self.generated += 1
+        key = normalize_term(term)
+        if not PDFRedactor.validate_match_context(None, None, key):
+            return
+        entry = self._terms.get(key)
+        if entry is None:
+            entry = self._terms[key] = PlanTerm(term, term_type)
+            self._matcher = None
+        for source in sources:
+            source = tuple(source)
+            if source not in entry.sources:
+                entry.sources.append(source)
+
+    def add_item(self, section: str, item: str, term_type: str = None) -> None:
+        """Add every search variant of one detected item."""
+        from resume_redactor.redactor import PDFRedactor
+
+        item = item.strip()
+        if not item:
+            return
+        term_type = term_type or PDFRedactor.determine_term_type(item, section)
+        for term in PDFRedactor.generate_smart_search_terms(item, term_type):
+            self._add(term, term_type, [(section, item)])
+
+    @classmethod
+    def compile(cls, resume_data: "ResumeData", selected_sections: Dict[str, bool],
+                selected_items: Dict[str, List[str]] = None) -> "RedactionPlan":
+        """Build a plan from detection results and the user's selection.
+
+        With ``selected_items`` only those items are used, typed from their
+        content; otherwise every field of each enabled section is used, typed
+        by field.
+        """
+        plan = cls()
+        if selected_items:
+            for section, items in selected_items.items():
+                for item in items:
+                    plan.add_item(section, item)
+            return plan
+        for section, fields in FIELD_TERM_TYPES.items():
+            if not selected_sections.get(section, False):
+                continue
+            data = getattr(resume_data, section)
+            for field, term_type in fields.items():
+                for item in getattr(data, field):
+                    plan.add_item(section, item, term_type)
+        return plan
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[str], source: str = "deny_list") -> "RedactionPlan":
+        """Build a plan from a plain list of strings, e.g. a deny list."""
+        plan = cls()
+        for term in terms:
+            plan.add_item(source, term)
+        return plan
+
+    def merged(self, other: "RedactionPlan") -> "RedactionPlan":
+        """Return a new plan with the terms of both plans."""
+        plan = RedactionPlan(list(self._terms.values()) + list(other._terms.values()))
+        plan.generated = self.generated + other.generated
+        return plan
+
+    @property
+    def terms(self) -> List[PlanTerm]:
+        return list(self._terms.values())
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def sources(self, term: str) -> List[Source]:
+        """Return the ``(section, item)`` pairs that produced ``term``."""
+        entry = self._terms.get(normalize_term(term))
+        return list(entry.sources) if entry else []
+
+    @property
+    def matcher(self) -> TermMatcher:
+        if self._matcher is None:
+            self._matcher = TermMatcher((t.term for t in self._terms.values()), drop_contained=True)
+        return self._matcher
+
+    def to_dict(self) -> Dict:
+        return {"version": PLAN_VERSION, "generated": self.generated,
+                "terms": [t.to_dict() for t in self._terms.values()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RedactionPlan":
+        if data.get("version") != PLAN_VERSION:
+            raise ValueError(f"unsupported redaction plan version: {data.get('version')}")
+        plan = cls(PlanTerm(t["term"], t.get("type", "general"), [tuple(s) for s in t.get("sources", [])])
+                   for t in data.get("terms", []))
+        plan.generated = data.get("generated", plan.generated)
+        return plan
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    @classmethod
+    def from_json(cls, text: str) -> "RedactionPlan":
+        return cls.from_dict(json.loads(text))
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(self.to_json())
+
+    @classmethod
+    def load(cls, path: str) -> "RedactionPlan":
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_json(fh.read())
@@ -0,0 +1,763 @@
+"""The redaction engine: detection of resume fields and their redaction.
+
+Importing this module only loads the standard library and the package's
+own light modules. PyMuPDF, ``requests``, pydantic and asyncio are imported
+where they are first used, so process-pool workers, the CLI and serverless
+handlers do not pay for what they never touch (see
+``benchmarks/bench_startup.py``).
+"""
+import json
+import logging
+import re
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Union
+
+from resume_redactor.chunking import DEFAULT_CHUNK_CHARS, chunk_pages, merge_results
+from resume_redactor.compaction import compact_pages, normalize_text
+from resume_redactor.detection_cache import DetectionCache
+from resume_redactor.detection_client import DetectionClient, estimate_tokens
+from resume_redactor.geometry import merge_rects
+from resume_redactor.local_detection import LOCAL_FIELDS, detect_local, merge_local
+from resume_redactor.metrics import emit, stage
+from resume_redactor.matching import TermMatcher
+from resume_redactor.output import DEFAULT_PROFILE, OUTPUT_PROFILES, Destination, write_pdf
+from resume_redactor.plan import RedactionPlan
+from resume_redactor.session import RedactionSession, Source
+
+if TYPE_CHECKING:
+    import fitz
+
+    from resume_redactor.match_cache import MatchCache
+    from resume_redactor.models import ResumeData
+    from resume_redactor.streaming import FieldCallback
+
+logger = logging.getLogger(__name__)
+
+OPENAI_MODEL = "gpt-4o-mini"
+OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
+PROMPT_VERSION = "3"
+# join same-line hits separated by about one space so adjacent terms share one annotation
+COALESCE_GAP = 1.5
+PROMPT_SCHEMA = {
+    "personal_info": {
+        "emails": [],
+        "phone_numbers": [],
+        "names": [],
+        "addresses": [],
+        "linkedin_urls": [],
+        "github_urls": [],
+        "other_urls": [],
+        "locations": [],
+    },
+    "education": {
+        "institutions": [],
+        "graduation_years": [],
+    },
+    "experience": {
+        "companies": [],
+        "project_titles": [],
+    },
+}
+
+
+STOP_WORDS = {
+    'in', 'at', 'on', 'of', 'the', 'and', 'or', 'but', 'a', 'an', 'to', 'for', 
+    'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you',
+    'he', 'she', 'it', 'we', 'him', 'her', 'us', 'them', 'my',
+    'your', 'his', 'her', 'its', 'our', 'their'
+}
+
+
+class PDFRedactor:
+    def __init__(self, api_key: str, cache: DetectionCache = None, client: DetectionClient = None,
+                 api_url: str = OPENAI_API_URL, structured_output: bool = True):
+        self.api_key = api_key
+        self.structured_output = structured_output
+        self.cache = cache
+        self.last_error = None
+        self.last_report = {}
+        self.api_url = client.api_url if client is not None else api_url
+        self.headers = {'Content-Type': 'application/json', 'Authorization': f'Bearer {api_key}'}
+        self.client = client if client is not None else DetectionClient(api_key, self.api_url)
+
+    @staticmethod
+    def extract_text(pdf: Union[Source, RedactionSession]) -> str:
+        with RedactionSession.use(pdf) as session, stage("extract", pages=session.page_count) as event:
+            text = session.text()
+            event["chars"] = len(text)
+            return text
+
+    def flatten_extracted_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        flattened = {}
+        for section, section_data in data.items():
+            if isinstance(section_data, dict):
+                flattened[section] = {}
+                for key, value in section_data.items():
+                    if isinstance(value, list):
+                        flat_list = []
+                        for item in value:
+                            if isinstance(item, dict):
+                                flat_list.extend([str(v) for v in item.values() if v and str(v).strip()])
+                            elif isinstance(item, str) and item.strip():
+                                flat_list.append(item.strip())
+                            elif item and str(item).strip():
+                                flat_list.append(str(item).strip())
+                        flattened[section][key] = flat_list
+                    else:
+                        flattened[section][key] = []
+            else:
+                flattened[section] = section_data if section_data else {}
+        return flattened
+
+    @staticmethod
+    def prompt_schema(exclude: Dict[str, List[str]] = None,
+                      sections: Iterable[str] = None) -> Dict[str, Dict[str, list]]:
+        """``PROMPT_SCHEMA`` limited to ``sections`` (default: all), without the ``exclude`` fields."""
+        schema = {}
+        for section, fields in PROMPT_SCHEMA.items():
+            if sections is not None and section not in sections:
+                continue
+            skipped = (exclude or {}).get(section, [])
+            kept = {k: v for k, v in fields.items() if k not in skipped}
+            if kept:
+                schema[section] = kept
+        return schema
+
+    @staticmethod
+    def build_prompt(text: str, exclude: Dict[str, List[str]] = None, sections: Iterable[str] = None) -> str:
+        schema = PDFRedactor.prompt_schema(exclude, sections)
+        return ("Extract information from the resume text and return ONLY valid JSON with exactly this structure:\n"
+                f"{json.dumps(schema, separators=(',', ':'))}\nResume text:\n{text}")
+
+    @staticmethod
+    def response_format(schema: Dict[str, Dict[str, list]]) -> Dict[str, Any]:
+        """A strict JSON-schema ``response_format`` asking for ``schema``'s fields as string arrays."""
+        properties = {
+            section: {
+                "type": "object",
+                "properties": {field: {"type": "array", "items": {"type": "string"}} for field in fields},
+                "required": list(fields),
+                "additionalProperties": False,
+            }
+            for section, fields in schema.items()
+        }
+        return {"type": "json_schema", "json_schema": {"name": "resume_fields", "strict": True, "schema": {
+            "type": "object", "properties": properties, "required": list(schema), "additionalProperties": False}}}
+
+    def detect_resume_info(self, text: str, mode: str = "llm", sections: Iterable[str] = None,
+                           pages: List[str] = None, on_field: "FieldCallback" = None) -> "ResumeData":
+        """Detect resume fields.
+
+        ``mode`` is ``"llm"`` (model only), ``"local"`` (regex tier only, no
+        network) or ``"hybrid"`` (regex tier for the fields it covers, model
+        for the rest). Only the fields of ``sections`` (default: all) are
+        requested. ``text`` is compacted first; given its ``pages`` as well,
+        running headers and footers are dropped too. A summary of latency,
+        prompt size and token savings is left in ``last_report``.
+
+        With ``on_field``, the completion is streamed and
+        ``on_field(section, field, values)`` is called as each field closes
+        in the stream (and at once for fields the local tier found), ahead
+        of the complete result.
+        """
+        with stage("detect", finish=self._detection_fields, chars=len(text)):
+            pages, local, exclude = self._start_detection(text, mode, sections, pages, on_field)
+            if mode == "local":
+                return local
+            text = "\n".join(pages)
+            start = time.perf_counter()
+            cached, cache_key, payload = self._prepare_remote(text, exclude, sections, stream=on_field is not None)
+            if cached is not None:
+                remote = cached
+            else:
+                try:
+                    response = self.client.post(payload, stream=on_field is not None)
+                except Exception as e:
+                    response = e
+                remote = self._finish_remote(response, cache_key, on_field, start)
+            self.last_report["remote_ms"] = (time.perf_counter() - start) * 1000
+            return self._finish_detection(text, mode, local, remote, exclude, sections)
+
+    async def detect_resume_info_async(self, text: str, mode: str = "llm", sections: Iterable[str] = None,
+                                       pages: List[str] = None, on_field: "FieldCallback" = None) -> "ResumeData":
+        """Async variant of :meth:`detect_resume_info`.
+
+        ``last_error`` and ``last_report`` are per instance, so concurrent
+        documents should each use their own ``PDFRedactor`` sharing one
+        ``DetectionClient``. A streamed body is read on a worker thread,
+        which is where ``on_field`` is called from.
+        """
+        import asyncio
+
+        with stage("detect", finish=self._detection_fields, chars=len(text)):
+            pages, local, exclude = self._start_detection(text, mode, sections, pages, on_field)
+            if mode == "local":
+                return local
+            text = "\n".join(pages)
+            start = time.perf_counter()
+            cached, cache_key, payload = self._prepare_remote(text, exclude, sections, stream=on_field is not None)
+            if cached is not None:
+                remote = cached
+            else:
+                try:
+                    response = await self.client.apost(payload, stream=on_field is not None)
+                except Exception as e:
+                    response = e
+                if on_field is not None:
+                    remote = await asyncio.to_thread(self._finish_remote, response, cache_key, on_field, start)
+                else:
+                    remote = self._finish_remote(response, cache_key)
+            self.last_report["remote_ms"] = (time.perf_counter() - start) * 1000
+            return self._finish_detection(text, mode, local, remote, exclude, sections)
+
+    def detect_document(self, pdf: Union[Source, RedactionSession], mode: str = "llm",
+                        max_chars: int = DEFAULT_CHUNK_CHARS, sections: Iterable[str] = None,
+                        on_field: "FieldCallback" = None) -> "ResumeData":
+        """Detect over a whole document, chunking it when the text exceeds ``max_chars``.
+
+        ``on_field`` streams single-shot detection (see :meth:`detect_resume_info`);
+        chunked documents are not streamed, their chunks already arrive concurrently.
+        """
+        with RedactionSession.use(pdf) as session:
+            pages = session.page_texts()
+            text = session.text()
+        if mode != "local" and max_chars and len(text) > max_chars:
+            return self.detect_resume_info_chunked(pages, mode, max_chars, sections)
+        return self.detect_resume_info(text, mode, sections, pages, on_field)
+
+    def detect_resume_info_chunked(self, pages: List[str], mode: str = "llm",
+                                   max_chars: int = DEFAULT_CHUNK_CHARS,
+                                   sections: Iterable[str] = None) -> "ResumeData":
+        """Blocking wrapper around :meth:`detect_resume_info_chunked_async`."""
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        coro = self.detect_resume_info_chunked_async(pages, mode, max_chars, sections)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # called from inside an event loop: run on a separate one
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
+    async def detect_resume_info_chunked_async(self, pages: List[str], mode: str = "llm",
+                                               max_chars: int = DEFAULT_CHUNK_CHARS,
+                                               sections: Iterable[str] = None) -> "ResumeData":
+        """Detect over page-packed chunks sent concurrently, then merge the results.
+
+        Latency is bounded by the slowest chunk instead of the whole document,
+        and each chunk is cached on its own. If any chunk fails the merged
+        result is partial and ``last_error`` says how many chunks were lost.
+        """
+        import asyncio
+
+        text = "\n".join(pages)
+        with stage("detect", finish=self._detection_fields, chars=len(text)):
+            pages, local, exclude = self._start_detection(text, mode, sections, pages)
+            if mode == "local":
+                return local
+            text = "\n".join(pages)
+            chunks = chunk_pages(pages, max_chars)
+            errors = []
+            usage = {}
+            chunk_ms = []
+
+            async def detect_chunk(chunk: str) -> "ResumeData":
+                chunk_start = time.perf_counter()
+                cached, cache_key, payload = self._prepare_remote(chunk, exclude, sections)
+                if cached is not None:
+                    return cached
+                try:
+                    response = await self.client.apost(payload)
+                except Exception as e:
+                    response = e
+                # no await below, so per-chunk state on self cannot interleave
+                self.last_error = None
+                result = self._finish_remote(response, cache_key)
+                if self.last_error:
+                    errors.append(self.last_error)
+                for key, value in (self.last_report.pop("usage", None) or {}).items():
+                    if isinstance(value, int):
+                        usage[key] = usage.get(key, 0) + value
+                chunk_ms.append((time.perf_counter() - chunk_start) * 1000)
+                return result
+
+            start = time.perf_counter()
+            results = await asyncio.gather(*(detect_chunk(chunk) for chunk in chunks))
+            self.last_error = None
+            if errors:
+                self.last_error = f"{len(errors)} of {len(chunks)} chunks failed: {errors[0]}"
+            report = self.last_report
+            report["remote_ms"] = (time.perf_counter() - start) * 1000
+            report["chunks"] = len(chunks)
+            report["slowest_chunk_ms"] = max(chunk_ms, default=0.0)
+            if usage:
+                report["usage"] = usage
+            remote = merge_results(results)
+            return self._finish_detection(text, mode, local, remote, exclude, sections)
+
+    def _start_detection(self, text: str, mode: str, sections: Iterable[str] = None, pages: List[str] = None,
+                         on_field: "FieldCallback" = None):
+        """Validate ``mode``, compact the text and run the local tier; return ``(pages, local, exclude)``."""
+        if mode not in ("llm", "local", "hybrid"):
+            raise ValueError(f"unknown detection mode: {mode}")
+        self.last_error = None
+        report = {"mode": mode, "local_ms": 0.0, "remote_ms": 0.0, "cached": False}
+        self.last_report = report
+        pages = compact_pages(pages) if pages is not None else [normalize_text(text)]
+        compacted = "\n".join(pages)
+        exclude = LOCAL_FIELDS if mode == "hybrid" else None
+        report["prompt_tokens_raw"] = estimate_tokens(self.build_prompt(text))
+        report["prompt_tokens_compact"] = estimate_tokens(self.build_prompt(compacted, exclude, sections))
+        logger.info("detection prompt: %d -> %d estimated tokens (%d -> %d chars of text)",
+                    report["prompt_tokens_raw"], report["prompt_tokens_compact"], len(text), len(compacted))
+        local = None
+        if mode != "llm":
+            start = time.perf_counter()
+            local = detect_local(compacted)
+            report["local_ms"] = (time.perf_counter() - start) * 1000
+            if on_field is not None:
+                for section, fields in LOCAL_FIELDS.items():
+                    for field in fields:
+                        on_field(section, field, list(getattr(getattr(local, section), field)))
+        if mode == "local":
+            report["prompt_tokens_saved"] = estimate_tokens(self.build_prompt(compacted, sections=sections))
+        return pages, local, exclude
+
+    def _detection_fields(self) -> Dict[str, Any]:
+        report = self.last_report
+        fields = {"mode": report.get("mode"), "cached": report.get("cached", False),
+                  "error": bool(self.last_error)}
+        if report.get("chunks"):
+            fields["chunks"] = report["chunks"]
+        for key in ("prompt_tokens_raw", "prompt_tokens_compact", "first_field_ms"):
+            if key in report:
+                fields[key] = report[key]
+        for key, value in (report.get("usage") or {}).items():
+            if key in ("prompt_tokens", "completion_tokens", "total_tokens") and isinstance(value, int):
+                fields[key] = value
+        return fields
+
+    def _finish_detection(self, text: str, mode: str, local: "ResumeData", remote: "ResumeData",
+                          exclude: Dict[str, List[str]], sections: Iterable[str] = None) -> "ResumeData":
+        if mode == "llm":
+            return remote
+        report = self.last_report
+        report["prompt_tokens_saved"] = (estimate_tokens(self.build_prompt(text, sections=sections))
+                                         - estimate_tokens(self.build_prompt(text, exclude, sections)))
+        local_values = {section: {field: getattr(getattr(local, section), field) for field in fields}
+                        for section, fields in LOCAL_FIELDS.items()}
+        report["completion_tokens_saved"] = estimate_tokens(json.dumps(local_values))
+        if self.last_error:
+            return local
+        return merge_local(remote, local)
+
+    def _prepare_remote(self, text: str, exclude: Dict[str, List[str]] = None, sections: Iterable[str] = None,
+                        stream: bool = False):
+        """Return ``(cached_result, cache_key, payload)`` for a model request."""
+        from resume_redactor.models import ResumeData
+
+        schema = self.prompt_schema(exclude, sections)
+        if not schema:
+            # the local tier covers every requested field
+            return ResumeData(), None, None
+        cache_key = None
+        if self.cache is not None:
+            prompt_version = PROMPT_VERSION + ("-hybrid" if exclude else "")
+            if sections is not None and set(sections) != set(PROMPT_SCHEMA):
+                prompt_version += "-" + ",".join(sorted(set(sections) & set(PROMPT_SCHEMA)))
+            cache_key = DetectionCache.make_key(text, OPENAI_MODEL, prompt_version)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.last_report["cached"] = True
+                return ResumeData.model_validate_json(cached), cache_key, None
+        prompt = self.build_prompt(text, exclude, sections)
+        payload = {
+            "model": OPENAI_MODEL,
+            "messages": [
+                {"role": "system", "content": "Return strictly valid JSON with flat string arrays only."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.1,
+            "max_tokens": 2000,
+        }
+        if self.structured_output:
+            payload["response_format"] = self.response_format(schema)
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+        return None, cache_key, payload
+
+    def _finish_remote(self, response, cache_key: str = None, on_field: "FieldCallback" = None,
+                       start: float = None) -> "ResumeData":
+        from resume_redactor.models import ResumeData
+
+        try:
+            if isinstance(response, Exception):
+                raise response
+            if response.status_code != 200:
+                self.last_error = f"OpenAI API Error: {response.status_code} - {response.text}"
+                logger.error(self.last_error)
+                # a streamed response holds its pooled connection until closed
+                response.close()
+                return ResumeData()
+            if on_field is not None:
+                from resume_redactor.streaming import read_completion
+
+                content, usage = read_completion(response, self._field_reporter(on_field, start))
+                self.last_report["usage"] = usage
+                content = content.strip()
+            else:
+                body = response.json()
+                self.last_report["usage"] = body.get("usage")
+                content = body['choices'][0]['message']['content'].strip()
+            try:
+                # structured output: the reply is the schema's JSON, nothing else
+                resume_data = ResumeData.model_validate_json(content)
+            except ValueError:
+                resume_data = self._parse_freeform(content)
+            if cache_key is not None:
+                self.cache.set(cache_key, resume_data.model_dump_json())
+            return resume_data
+        except Exception as e:
+            self.last_error = f"Error: {e}"
+            logger.error(self.last_error)
+            return ResumeData()
+
+    def _field_reporter(self, on_field: "FieldCallback", start: float = None):
+        """Adapt ``on_field`` to the parser's ``(path, value)`` callbacks, timing the first field."""
+        start = start if start is not None else time.perf_counter()
+
+        def report(path, value) -> None:
+            if len(path) != 2 or path[0] not in PROMPT_SCHEMA:
+                return
+            section, field = path
+            self.last_report.setdefault("first_field_ms", (time.perf_counter() - start) * 1000)
+            on_field(section, field, self.flatten_extracted_data({section: {field: value}})[section][field])
+
+        return report
+
+    def _parse_freeform(self, content: str) -> "ResumeData":
+        """Parse a reply from a backend without structured output: fenced, nested or loosely typed JSON."""
+        from resume_redactor.models import ResumeData
+
+        if content.startswith("```"):
+            lines = content.split("\n")
+            json_start = -1
+            json_end = -1
+            for i, line in enumerate(lines):
+                if line.strip().startswith("{"):
+                    json_start = i
+                    break
+            for i in range(len(lines) - 1, -1, -1):
+                if lines[i].strip().endswith("}"):
+                    json_end = i
+                    break
+            if json_start != -1 and json_end != -1:
+                content = "\n".join(lines[json_start:json_end + 1])
+        data = json.loads(content)
+        flattened_data = self.flatten_extracted_data(data)
+        return ResumeData.model_validate(flattened_data)
+
+    @staticmethod
+    def find_images(pdf: Union[Source, RedactionSession]) -> List[Dict[str, Any]]:
+        """List embedded images once per xref, with metadata only.
+
+        Nothing is decoded here; use ``RedactionSession.thumbnail`` for a preview.
+        """
+        with RedactionSession.use(pdf) as session, stage("images", pages=session.page_count) as event:
+            images = [info.to_dict() for info in session.images.images()]
+            event["images"] = len(images)
+            return images
+
+    @staticmethod
+    def is_valid_redaction_term(term: str, term_type: str = "general", min_length: int = 3) -> bool:
+        term = term.strip()
+        if len(term) < min_length:
+            return False
+        if term.lower() in STOP_WORDS and term_type not in ["email", "phone", "url"]:
+            return False
+        if len(term) == 1:
+            return False
+        if term.isdigit() and len(term) < 4 and term_type not in ["phone", "date", "year"]:
+            return False
+        generic_terms = {
+            'university', 'college', 'school', 'degree', 'bachelor', 'master',
+            'phd', 'doctorate', 'certificate', 'diploma', 'science', 'arts',
+            'engineering', 'technology', 'management', 'business', 'computer',
+            'information', 'systems', 'software', 'development'
+        }
+        if term.lower() in generic_terms and term_type not in ["institution", "company"]:
+            return False
+        return True
+
+    @staticmethod
+    def generate_smart_search_terms(term: str, term_type: str = "general") -> List[str]:
+        if not term or len(term.strip()) < 2:
+            return []
+        term = term.strip()
+        search_terms = []
+        if PDFRedactor.is_valid_redaction_term(term, term_type):
+            search_terms.append(term)
+        if term_type == "email":
+            search_terms.extend([term.lower(), term.upper()])
+        elif term_type == "phone":
+            digits_only = re.sub(r'[^\d+]', '', term)
+            if len(digits_only) >= 10:
+                search_terms.append(digits_only)
+                if len(digits_only) == 10:
+                    search_terms.extend([
+                        f"({digits_only[:3]}) {digits_only[3:6]}-{digits_only[6:]}",
+                        f"{digits_only[:3]}-{digits_only[3:6]}-{digits_only[6:]}",
+                        f"{digits_only[:3]}.{digits_only[3:6]}.{digits_only[6:]}"
+                    ])
+                elif len(digits_only) == 11 and digits_only.startswith('1'):
+                    clean_num = digits_only[1:]
+                    search_terms.extend([
+                        f"({clean_num[:3]}) {clean_num[3:6]}-{clean_num[6:]}",
+                        f"1-{clean_num[:3]}-{clean_num[3:6]}-{clean_num[6:]}"
+                    ])
+        elif term_type == "name":
+            search_terms.extend([term.lower(), term.upper(), term.title()])
+            parts = [p.strip() for p in term.split() if p.strip()]
+            if len(parts) == 2:
+                first, last = parts
+                if (len(first) > 2 and len(last) > 2 and
+                    first.isalpha() and last.isalpha() and
+                    first.lower() not in STOP_WORDS and last.lower() not in STOP_WORDS):
+                    search_terms.extend([first, last, first.title(), last.title()])
+        elif term_type == "url":
+            search_terms.append(term.lower())
+            if term.startswith(('http://', 'https://')):
+                clean_url = term.split('://', 1)[1]
+                search_terms.append(clean_url)
+        elif term_type == "institution":
+            search_terms.extend([term.lower(), term.upper(), term.title()])
+            if "university" in term.lower() and len(term.split()) > 2:
+                words = term.split()
+                if len(words) >= 3:
+                    abbrev = ''.join([w.upper() for w in words[:3] if len(w) > 3])
+                    if len(abbrev) >= 2:
+                        search_terms.append(abbrev)
+        elif term_type == "company":
+            search_terms.extend([term.lower(), term.upper(), term.title()])
+            business_suffixes = ['Inc.', 'LLC', 'Corp.', 'Ltd.', 'Co.', 'Company', 'Corporation']
+            clean_term = term
+            for suffix in business_suffixes:
+                if clean_term.endswith(suffix):
+                    clean_term = clean_term[:-len(suffix)].strip()
+                    if len(clean_term) > 3:
+                        search_terms.append(clean_term)
+        elif term_type == "degree":
+            search_terms.extend([term.lower(), term.upper(), term.title()])
+        elif term_type == "date" or term_type == "year":
+            search_terms.append(term)
+        else:
+            search_terms.extend([term.lower(), term.upper(), term.title()])
+        valid_terms = []
+        seen = set()
+        for search_term in search_terms:
+            clean_term = search_term.strip()
+            if (clean_term and clean_term not in seen and
+                PDFRedactor.is_valid_redaction_term(clean_term, term_type)):
+                seen.add(clean_term)
+                valid_terms.append(clean_term)
+        return valid_terms
+
+    @staticmethod
+    def determine_term_type(item: str, category: str) -> str:
+        item = item.lower()
+        if '@' in item and '.' in item:
+            return "email"
+        elif any(c.isdigit() for c in item) and any(c in item for c in ['-', '(', ')', '+', ' ', '.']):
+            digit_count = sum(1 for c in item if c.isdigit())
+            if digit_count >= 7:
+                return "phone"
+        elif item.startswith(('http://', 'https://', 'www.')):
+            return "url"
+        elif category == "personal_info":
+            if any(c.isalpha() for c in item) and not any(c.isdigit() for c in item):
+                return "name"
+        elif category == "education":
+            if "university" in item or "college" in item or "institute" in item:
+                return "institution"
+            elif any(word in item for word in ["bachelor", "master", "phd", "degree", "diploma"]):
+                return "degree"
+            elif item.isdigit() and len(item) == 4:
+                return "year"
+        elif category == "experience":
+            if any(word in item for word in ["inc", "corp", "llc", "ltd", "company", "technologies"]):
+                return "company"
+            elif re.match(r'^\d{4}', item) or '-' in item:
+                return "date"
+            elif "project" in item or "system" in item or len(item.split()) >= 2:
+                return "project"
+        return "general"
+
+    @staticmethod
+    def select_items(resume_data: "ResumeData", sections: List[str],
+                     term_types: List[str] = None) -> Dict[str, List[str]]:
+        selected = {}
+        for section in sections:
+            items = []
+            for values in getattr(resume_data, section).model_dump().values():
+                for item in values:
+                    if not item.strip():
+                        continue
+                    if term_types and PDFRedactor.determine_term_type(item, section) not in term_types:
+                        continue
+                    items.append(item)
+            if items:
+                selected[section] = items
+        return selected
+
+    @staticmethod
+    def validate_match_context(page, rect, term: str) -> bool:
+        if len(term) <= 2:
+            return False
+        if term.lower() in STOP_WORDS:
+            return False
+        return True
+
+    @staticmethod
+    def merge_overlapping_rects(rects: List, coalesce_gap: float = 0.0) -> List:
+        if not rects:
+            return []
+        import fitz
+
+        return [fitz.Rect(box) for box in merge_rects(rects, coalesce_gap)]
+
+    @staticmethod
+    def redact_pdf_section_wise(pdf: Union[Source, RedactionSession], resume_data: "ResumeData",
+                            selected_sections: Dict[str, bool],
+                            redact_images: bool = False,
+                            selected_items: Dict[str, List[str]] = None,
+                            stats: Dict[str, int] = None,
+                            coalesce_gap: float = COALESCE_GAP,
+                            workers: int = 1, output: Destination = None,
+                            profile: str = DEFAULT_PROFILE, memory_budget: int = None,
+                            match_cache: "MatchCache" = None) -> Union[bytes, int]:
+        plan = RedactionPlan.compile(resume_data, selected_sections, selected_items)
+        return PDFRedactor.apply_plan(pdf, plan, redact_images, stats, coalesce_gap, workers, output, profile,
+                                      memory_budget, match_cache)
+
+    @staticmethod
+    def apply_plan(pdf: Union[Source, RedactionSession], plan: RedactionPlan,
+                   redact_images: bool = False, stats: Dict[str, int] = None,
+                   coalesce_gap: float = COALESCE_GAP, workers: int = 1, output: Destination = None,
+                   profile: str = DEFAULT_PROFILE, memory_budget: int = None,
+                   match_cache: "MatchCache" = None) -> Union[bytes, int]:
+        """Redact every hit of a compiled plan and return the new PDF bytes.
+
+        With ``workers`` > 1, documents of at least ``PARALLEL_MIN_PAGES``
+        pages are split into page ranges redacted in separate processes,
+        unless they have an outline, links or form fields, which stitching
+        would break.
+        With a ``memory_budget`` in bytes, pages are instead redacted one
+        window at a time within that budget (see ``large_file.py``). With a
+        ``match_cache``, only terms and pages that changed since the last
+        redaction of the same document are searched and redacted again (see
+        ``match_cache.py``); only its full redactions use the ``workers``.
+        The result is written with output ``profile``; given ``output`` (a
+        path or writable file object) it is streamed there and the number of
+        bytes written is returned instead.
+        """
+        from resume_redactor.large_file import redact_windowed
+        from resume_redactor.match_cache import redact_incremental
+        from resume_redactor.parallel import PARALLEL_MIN_PAGES, has_references, redact_parallel
+
+        if profile not in OUTPUT_PROFILES:
+            raise ValueError(f"unknown output profile: {profile}")
+        if stats is None:
+            stats = {}
+        stats.update({"pages": 0, "terms": 0, "text_redactions": 0, "image_redactions": 0})
+        matcher = plan.matcher
+        stats["terms"] = len(matcher)
+        with RedactionSession.use(pdf) as session:
+            if memory_budget is not None:
+                return redact_windowed(session, plan, redact_images, stats, coalesce_gap, memory_budget, output,
+                                       profile)
+            if match_cache is not None:
+                return redact_incremental(session, plan, redact_images, stats, coalesce_gap, match_cache, output,
+                                          profile, workers)
+            if workers > 1 and session.page_count >= PARALLEL_MIN_PAGES and not has_references(session.doc):
+                return redact_parallel(session, plan, redact_images, stats, coalesce_gap, workers, output,
+                                       profile)
+            with session.edit() as doc, \
+                    stage("redact", terms=len(matcher), bytes_in=session.size) as event:
+                stats["pages"] = event["pages"] = len(doc)
+                hits = PDFRedactor.redact_pages(session, doc, range(len(doc)), matcher, redact_images,
+                                                stats, coalesce_gap)
+                event.update(hits=hits, annotations=stats["text_redactions"] + stats["image_redactions"])
+                # errors propagate: returning the source document instead would look like a redaction
+                data = write_pdf(doc, output, profile, session.size)
+                event["bytes_out"] = data if output is not None else len(data)
+                return data
+
+    @staticmethod
+    def redact_pages(session: RedactionSession, doc: "fitz.Document", page_numbers: Iterable[int],
+                     matcher: TermMatcher, redact_images: bool, stats: Dict[str, int],
+                     coalesce_gap: float = COALESCE_GAP,
+                     page_rects: Dict[int, List["fitz.Rect"]] = None) -> int:
+        """Search, annotate and apply redactions on ``page_numbers`` of ``doc``; return the hit count.
+
+        ``page_rects`` supplies the hit rects of pages already matched elsewhere
+        (see ``match_cache.py``); those pages are not searched again.
+        """
+        timings = dict.fromkeys(("match", "annotate", "apply"), 0.0)
+        hits = 0
+        annotations = stats["text_redactions"] + stats["image_redactions"]
+        pages = 0
+        for page_num in page_numbers:
+            page = doc[page_num]
+            pages += 1
+            mark = time.perf_counter()
+            redaction_rects = []
+            if page_rects is not None and page_num in page_rects:
+                redaction_rects = list(page_rects[page_num])
+            else:
+                try:
+                    for term, rect in matcher.search_page(page, session.page_words(page_num)):
+                        if PDFRedactor.validate_match_context(page, rect, term):
+                            redaction_rects.append(rect + (-0.5, -0.5, 0.5, 0.5))
+                except Exception:
+                    pass
+            hits += len(redaction_rects)
+            merged_regular_rects = PDFRedactor.merge_overlapping_rects(redaction_rects, coalesce_gap)
+            now = time.perf_counter()
+            timings["match"], mark = timings["match"] + now - mark, now
+            for rect in merged_regular_rects:
+                try:
+                    annot = page.add_redact_annot(rect)
+                    annot.set_colors(stroke=None, fill=(0, 0, 0))
+                    annot.update()
+                    stats["text_redactions"] += 1
+                except Exception:
+                    pass
+            if redact_images:
+                try:
+                    for _, bbox in session.images.on_page(page_num):
+                        try:
+                            annot = page.add_redact_annot(bbox)
+                            annot.set_colors(stroke=None, fill=(0, 0, 0))
+                            annot.update()
+                            stats["image_redactions"] += 1
+                        except Exception:
+                            pass
+                except Exception:
+                    pass
+            now = time.perf_counter()
+            timings["annotate"], mark = timings["annotate"] + now - mark, now
+            try:
+                page.apply_redactions()
+            except Exception:
+                pass
+            timings["apply"] += time.perf_counter() - mark
+        annotations = stats["text_redactions"] + stats["image_redactions"] - annotations
+        emit("match", timings["match"], pages=pages, terms=len(matcher), hits=hits)
+        emit("annotate", timings["annotate"], annotations=annotations)
+        emit("apply", timings["apply"], pages=pages)
+        return hits
@@ -0,0 +1,574 @@
+"""HTTP service exposing detection, planning and redaction.
+
+    python -m resume_redactor.service --port 8080 --workers 4 --queue-size 16
+
+Endpoints (request and response bodies are JSON unless noted; detection
+results use the ``ResumeData`` schema):
+
+* ``POST /v1/detect``: PDF body. Returns ``{"resume_data": ..., "detection": ...}``.
+* ``POST /v1/plan``: ``PlanRequest`` body. Returns a ``RedactionPlan`` as JSON.
+  Planning is cheap and is answered inline.
+* ``POST /v1/redact``: either a PDF body with the ``RedactOptions`` as query
+  parameters (``?sections=personal_info,education&redact_images=1``), or a
+  ``RedactRequest`` JSON body with the PDF base64-encoded and optionally the
+  ``resume_data`` or ``plan`` to use instead of detecting. Returns the redacted
+  PDF, with the redaction counts in the ``X-Redaction-Stats`` header. A plan
+  without terms is refused with 422 unless ``allow_empty`` is set, so a
+  selection that matches nothing never comes back as the original document.
+* ``GET /v1/jobs/<id>`` and ``GET /v1/jobs/<id>/result``: job status and
+  result for asynchronous requests.
+* ``GET /healthz``: queue depth and capacity. ``GET /metrics``: OpenMetrics.
+
+Detect and redact requests become jobs on a process pool, initialised like
+the batch CLI's workers. At most ``workers + queue_size`` jobs are admitted
+at a time; beyond that the service answers 429 with a ``Retry-After``
+estimated from recent job times. With ``?async=1`` (or ``Prefer:
+respond-async``) a request returns 202 and a job location to poll at once;
+synchronous requests that outlive ``--request-timeout`` turn into such a
+reply as well. JSON bodies over ``--max-body-mb`` and PDF bodies over
+``--max-upload-mb`` are refused with 413.
+
+PDF bodies over ``SPOOL_BYTES`` are copied to a temporary file instead of
+being read into memory. The worker opens the file by path, writes the
+redacted PDF next to it and the response is streamed from there, so a large
+scan is never held whole by the server. With ``--memory-budget`` redaction
+runs a window of pages at a time within that budget (see ``large_file.py``),
+as in the batch CLI. Base64 PDFs in JSON bodies are always decoded in memory.
+
+Point ``--api-url`` at ``benchmarks/stub_openai.py --echo`` to run the whole
+service locally without model calls; ``benchmarks/load_service.py`` drives
+it and reports latency percentiles and throughput.
+"""
+import argparse
+import base64
+import binascii
+import json
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, ValidationError
+
+from resume_redactor.chunking import DEFAULT_CHUNK_CHARS
+from resume_redactor.cli import (DEFAULT_CACHE_PATH, SECTIONS, TERM_TYPES, _init_worker, _worker, compile_plan,
+                                 detect_document)
+from resume_redactor.metrics import CONTENT_TYPE, METRICS, collect
+from resume_redactor.models import ResumeData
+from resume_redactor.output import OUTPUT_PROFILES
+from resume_redactor.plan import RedactionPlan
+from resume_redactor.redactor import COALESCE_GAP, OPENAI_API_URL, PDFRedactor
+from resume_redactor.session import RedactionSession, Source
+
+logger = logging.getLogger(__name__)
+
+DETECTION_MODES = ("llm", "hybrid", "local")
+# finished jobs are kept this long for polling clients, and at most this many
+JOB_TTL = 600.0
+MAX_FINISHED_JOBS = 1000
+# PDF bodies larger than this are spooled to a temporary file, copied in blocks of SPOOL_BLOCK
+SPOOL_BYTES = 8 * 1024 * 1024
+SPOOL_BLOCK = 1024 * 1024
+
+
+class PlanRequest(BaseModel):
+    resume_data: ResumeData
+    sections: List[str] = list(SECTIONS)
+    term_types: List[str] = []
+
+
+class RedactOptions(BaseModel):
+    sections: List[str] = list(SECTIONS)
+    term_types: List[str] = []
+    detection_mode: Optional[str] = None
+    redact_images: bool = False
+    profile: str = "compact"
+    # return the document even when the plan has no terms, i.e. nothing but images is redacted
+    allow_empty: bool = False
+    # either skips detection
+    resume_data: Optional[ResumeData] = None
+    plan: Optional[Dict[str, Any]] = None
+
+
+class RedactRequest(RedactOptions):
+    pdf: str
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Dict[str, str] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class QueueFull(Exception):
+    pass
+
+
+def _check_selection(sections: List[str], term_types: List[str]) -> None:
+    for name, values, allowed in (("sections", sections, SECTIONS), ("term types", term_types, TERM_TYPES)):
+        unknown = set(values) - set(allowed)
+        if unknown:
+            raise HTTPError(400, f"unknown {name}: {', '.join(sorted(unknown))}")
+
+
+def _check_options(options: RedactOptions) -> None:
+    _check_selection(options.sections, options.term_types)
+    if options.detection_mode is not None and options.detection_mode not in DETECTION_MODES:
+        raise HTTPError(400, f"unknown detection mode: {options.detection_mode}")
+    if options.profile not in OUTPUT_PROFILES:
+        raise HTTPError(400, f"unknown output profile: {options.profile}")
+
+
+def _open(source: Source) -> RedactionSession:
+    try:
+        return RedactionSession(source)
+    except Exception as e:
+        raise ValueError(f"not a readable PDF: {e}") from None
+
+
+def _detect(session: RedactionSession, detection_mode: str, chunk_chars: int,
+            sections: List[str] = None) -> ResumeData:
+    if not PDFRedactor.extract_text(session).strip():
+        raise ValueError("no extractable text")
+    resume_data = detect_document(session, detection_mode, chunk_chars, sections)
+    if _worker["redactor"].last_error:
+        raise RuntimeError(_worker["redactor"].last_error)
+    return resume_data
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def run_detect(source: Source, detection_mode: str, chunk_chars: int) -> Dict[str, Any]:
+    with collect() as events, _open(source) as session:
+        resume_data = _detect(session, detection_mode, chunk_chars)
+    return {"resume_data": resume_data.model_dump(), "detection": _worker["redactor"].last_report,
+            "events": events}
+
+
+def run_redact(source: Source, options: Dict[str, Any], detection_mode: str, chunk_chars: int,
+               coalesce_gap: float, memory_budget: Optional[int] = None) -> Dict[str, Any]:
+    options = RedactOptions.model_validate(options)
+    # a spooled upload gets a spooled result, which the response streams from disk
+    output = source + ".out" if isinstance(source, str) else None
+    with collect() as events, _open(source) as session:
+        if options.plan is not None:
+            plan = RedactionPlan.from_dict(options.plan)
+        else:
+            resume_data = options.resume_data or _detect(session, options.detection_mode or detection_mode,
+                                                         chunk_chars, options.sections)
+            plan = compile_plan(resume_data, options.sections, options.term_types)
+        if not len(plan) and not options.allow_empty:
+            # returning the document would look like a successful redaction
+            raise ValueError("the redaction plan has no terms, so nothing would be redacted; "
+                             "pass allow_empty to get the document anyway")
+        stats = {"generated_terms": plan.generated}
+        data = PDFRedactor.apply_plan(session, plan, options.redact_images, stats, coalesce_gap,
+                                      output=output, profile=options.profile, memory_budget=memory_budget)
+    if output is not None:
+        return {"pdf_path": output, "stats": stats, "events": events}
+    return {"pdf": data, "stats": stats, "events": events}
+
+
+class Job:
+    def __init__(self, kind: str, future: Future, spool: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.future = future
+        self.spool = spool
+        self.submitted = time.time()
+        self.finished: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.error_status = 500
+        self.done = threading.Event()
+
+    @property
+    def status(self) -> str:
+        if self.finished is not None:
+            return "error" if self.error else "done"
+        return "running" if self.future.running() else "queued"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"job_id": self.id, "kind": self.kind, "status": self.status, "submitted": self.submitted,
+                "finished": self.finished, "error": self.error}
+        if self.result is not None:
+            if self.kind == "detect":
+                data["result"] = {key: self.result[key] for key in ("resume_data", "detection")}
+            else:
+                data["stats"] = self.result["stats"]
+                data["result_url"] = f"/v1/jobs/{self.id}/result"
+        return data
+
+    def discard(self) -> None:
+        """Remove the job's spooled result, if any."""
+        if self.result is not None and "pdf_path" in self.result:
+            _remove(self.result["pdf_path"])
+
+
+class JobQueue:
+    """Bounded admission in front of a process pool, with a table of jobs to poll."""
+
+    def __init__(self, workers: int, queue_size: int, initargs: Tuple, mp_context=None):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_worker,
+                                         initargs=initargs)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        # moving average of submit-to-finish latency
+        self._job_seconds = 1.0
+        self.active = 0
+
+    def submit(self, kind: str, fn: Callable, *args, spool: Optional[str] = None) -> Job:
+        """Run ``fn(*args)`` on the pool; the job owns ``spool``, a temporary input file, from here on."""
+        if not self._slots.acquire(blocking=False):
+            if spool is not None:
+                _remove(spool)
+            raise QueueFull()
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            if spool is not None:
+                _remove(spool)
+            raise
+        job = Job(kind, future, spool)
+        with self._lock:
+            self._evict()
+            self._jobs[job.id] = job
+            self.active += 1
+        future.add_done_callback(lambda f: self._finish(job, f))
+        return job
+
+    def _finish(self, job: Job, future: Future) -> None:
+        try:
+            job.result = future.result()
+            # stage events come from the worker processes; fold them into this process's registry
+            for event in job.result.pop("events", []):
+                METRICS.record(event)
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.error_status = 422 if isinstance(e, (ValueError, ValidationError)) else 500
+            if job.spool is not None:
+                _remove(job.spool + ".out")
+        if job.spool is not None:
+            _remove(job.spool)
+        job.finished = time.time()
+        with self._lock:
+            self.active -= 1
+            self._job_seconds = 0.8 * self._job_seconds + 0.2 * (job.finished - job.submitted)
+        self._slots.release()
+        job.done.set()
+
+    def _evict(self) -> None:
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished is not None]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+            job.discard()
+        for job in finished:
+            if job.id in self._jobs and now - job.finished > JOB_TTL:
+                del self._jobs[job.id]
+                job.discard()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free; while saturated one frees every latency / capacity."""
+        with self._lock:
+            return max(1, math.ceil(self._job_seconds / self.capacity))
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            for job in self._jobs.values():
+                job.discard()
+
+
+class RedactionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], jobs: JobQueue, max_body: int, request_timeout: float,
+                 detection_mode: str, chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                 coalesce_gap: float = COALESCE_GAP, max_upload: Optional[int] = None,
+                 memory_budget: Optional[int] = None):
+        super().__init__(address, ServiceHandler)
+        self.jobs = jobs
+        self.max_body = max_body
+        self.max_upload = max_body if max_upload is None else max_upload
+        self.memory_budget = memory_budget
+        self.request_timeout = request_timeout
+        self.detection_mode = detection_mode
+        self.chunk_chars = chunk_chars
+        self.coalesce_gap = coalesce_gap
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    server: RedactionServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug("%s " + format, self.address_string(), *args)
+
+    def _headers(self, status: int, length: int, content_type: str, headers: Dict[str, str] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None) -> None:
+        self._headers(status, len(body), content_type, headers)
+        self.wfile.write(body)
+
+    def _send_file(self, status: int, path: str, content_type: str, headers: Dict[str, str] = None) -> None:
+        with open(path, "rb") as fh:
+            self._headers(status, os.fstat(fh.fileno()).st_size, content_type, headers)
+            shutil.copyfileobj(fh, self.wfile, SPOOL_BLOCK)
+
+    def _json(self, status: int, body: Dict[str, Any], headers: Dict[str, str] = None) -> None:
+        self._send(status, json.dumps(body).encode("utf-8"), "application/json", headers)
+
+    def _body(self, upload: bool = False) -> Union[bytes, str]:
+        """Read the body; a PDF ``upload`` over ``SPOOL_BYTES`` is spooled and its file path returned."""
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.close_connection = True
+            raise HTTPError(411, "Content-Length required")
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # rfile.read(-1) would wait for the client to close the connection
+            self.close_connection = True
+            raise HTTPError(400, "invalid Content-Length")
+        limit = self.server.max_upload if upload else self.server.max_body
+        if length > limit:
+            # the body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            raise HTTPError(413, f"body of {length} bytes exceeds the limit of {limit}")
+        if upload and length > SPOOL_BYTES:
+            return self._spool(length)
+        return self.rfile.read(length)
+
+    def _spool(self, length: int) -> str:
+        fh = tempfile.NamedTemporaryFile(prefix="redact-", suffix=".pdf", delete=False)
+        try:
+            with fh:
+                while length:
+                    block = self.rfile.read(min(length, SPOOL_BLOCK))
+                    if not block:
+                        self.close_connection = True
+                        raise HTTPError(400, "request body ended early")
+                    fh.write(block)
+                    length -= len(block)
+        except BaseException:
+            _remove(fh.name)
+            raise
+        return fh.name
+
+    def _query(self) -> Dict[str, str]:
+        return {key: values[-1] for key, values in parse_qs(urlsplit(self.path).query).items()}
+
+    def _dispatch(self, handler: Callable[[], None]) -> None:
+        try:
+            handler()
+        except HTTPError as e:
+            self._json(e.status, {"error": {"message": str(e)}}, e.headers)
+        except (ValidationError, ValueError) as e:
+            self._json(400, {"error": {"message": str(e)}})
+        except Exception as e:
+            logger.exception("request %s failed", self.path)
+            self._json(500, {"error": {"message": f"{type(e).__name__}: {e}"}})
+
+    def do_GET(self):
+        self._dispatch(self._get)
+
+    def do_POST(self):
+        self._dispatch(self._post)
+
+    def _get(self) -> None:
+        path = urlsplit(self.path).path.rstrip("/")
+        jobs = self.server.jobs
+        if path == "/healthz":
+            self._json(200, {"status": "ok", "active": jobs.active, "capacity": jobs.capacity,
+                             "workers": jobs.workers})
+        elif path == "/metrics":
+            self._send(200, METRICS.render().encode("utf-8"), CONTENT_TYPE)
+        elif path.startswith("/v1/jobs/"):
+            parts = path[len("/v1/jobs/"):].split("/")
+            job = jobs.get(parts[0])
+            if job is None:
+                raise HTTPError(404, "unknown job")
+            if parts[1:] == ["result"]:
+                self._result(job)
+            elif len(parts) == 1:
+                self._json(200, job.to_dict())
+            else:
+                raise HTTPError(404, "not found")
+        else:
+            raise HTTPError(404, "not found")
+
+    def _post(self) -> None:
+        path = urlsplit(self.path).path.rstrip("/")
+        if path == "/v1/plan":
+            request = PlanRequest.model_validate_json(self._body())
+            _check_selection(request.sections, request.term_types)
+            self._json(200, compile_plan(request.resume_data, request.sections, request.term_types).to_dict())
+        elif path == "/v1/detect":
+            mode = self._query().get("mode", self.server.detection_mode)
+            if mode not in DETECTION_MODES:
+                raise HTTPError(400, f"unknown detection mode: {mode}")
+            self._submit("detect", run_detect, self._body(upload=True), mode, self.server.chunk_chars)
+        elif path == "/v1/redact":
+            options = self._redact_options()
+            self._submit("redact", run_redact, *options, self.server.detection_mode, self.server.chunk_chars,
+                         self.server.coalesce_gap, self.server.memory_budget)
+        else:
+            raise HTTPError(404, "not found")
+
+    def _redact_options(self) -> Tuple[Union[bytes, str], Dict[str, Any]]:
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+        if content_type == "application/json":
+            request = RedactRequest.model_validate_json(self._body())
+            try:
+                pdf_bytes = base64.b64decode(request.pdf, validate=True)
+            except binascii.Error:
+                raise HTTPError(400, "pdf is not valid base64")
+            _check_options(request)
+            return pdf_bytes, request.model_dump(exclude={"pdf"})
+        query = self._query()
+        fields = {}
+        for key in ("sections", "term_types"):
+            if key in query:
+                fields[key] = [value.strip() for value in query[key].split(",") if value.strip()]
+        for key in ("detection_mode", "profile"):
+            if key in query:
+                fields[key] = query[key]
+        for key in ("redact_images", "allow_empty"):
+            if key in query:
+                fields[key] = query[key].lower() in ("1", "true", "yes")
+        options = RedactOptions.model_validate(fields)
+        _check_options(options)
+        return self._body(upload=True), options.model_dump()
+
+    def _submit(self, kind: str, fn: Callable, source: Union[bytes, str], *args) -> None:
+        jobs = self.server.jobs
+        try:
+            job = jobs.submit(kind, fn, source, *args, spool=source if isinstance(source, str) else None)
+        except QueueFull:
+            raise HTTPError(429, "job queue is full", {"Retry-After": str(jobs.retry_after())})
+        query = self._query()
+        wants_async = (query.get("async", "").lower() in ("1", "true", "yes")
+                       or "respond-async" in self.headers.get("Prefer", ""))
+        if not wants_async and job.done.wait(self.server.request_timeout):
+            self._result(job)
+            return
+        self._json(202, job.to_dict(), {"Location": f"/v1/jobs/{job.id}"})
+
+    def _result(self, job: Job) -> None:
+        if job.finished is None:
+            self._json(409, {**job.to_dict(), "error": {"message": "job has not finished"}},
+                       {"Retry-After": "1"})
+        elif job.error:
+            self._json(job.error_status, {"job_id": job.id, "error": {"message": job.error}})
+        elif job.kind == "detect":
+            self._json(200, job.to_dict()["result"])
+        else:
+            headers = {"X-Redaction-Stats": json.dumps(job.result["stats"]), "X-Job-Id": job.id}
+            if "pdf_path" in job.result:
+                self._send_file(200, job.result["pdf_path"], "application/pdf", headers)
+            else:
+                self._send(200, job.result["pdf"], "application/pdf", headers)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="HTTP service for resume detection and redaction.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="redaction processes")
+    parser.add_argument("--queue-size", type=int, default=16,
+                        help="jobs admitted beyond the busy workers before answering 429")
+    parser.add_argument("--max-body-mb", type=float, default=20.0, help="largest accepted JSON request body")
+    parser.add_argument("--max-upload-mb", type=float, default=500.0,
+                        help=f"largest accepted PDF request body; those over {SPOOL_BYTES // 2**20} MB are "
+                             "spooled to disk")
+    parser.add_argument("--memory-budget", type=float, default=None, metavar="MB",
+                        help="redact a window of pages at a time within this much resident memory per job")
+    parser.add_argument("--request-timeout", type=float, default=30.0,
+                        help="synchronous requests taking longer are answered with 202 and a job to poll")
+    parser.add_argument("--detection-mode", choices=DETECTION_MODES, default="llm")
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS)
+    parser.add_argument("--max-concurrent-detections", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=120.0, help="read timeout per detection request")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--api-key", default=None, help="defaults to $OPENAI_API_KEY")
+    parser.add_argument("--api-url", default=None, help=f"defaults to $OPENAI_API_URL or {OPENAI_API_URL}")
+    parser.add_argument("--cache-path", default=None,
+                        help=f"detection cache (default: $DETECTION_CACHE_PATH or {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--no-cache", action="store_true")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    load_dotenv()
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    api_key = args.api_key or os.getenv("OPENAI_API_KEY", "")
+    cache_path = None if args.no_cache else (
+        args.cache_path or os.getenv("DETECTION_CACHE_PATH", DEFAULT_CACHE_PATH))
+    workers = max(1, args.workers)
+    client_options = {
+        "api_url": args.api_url or os.getenv("OPENAI_API_URL", OPENAI_API_URL),
+        "max_in_flight": max(1, args.max_concurrent_detections),
+        "timeout": (5.0, args.timeout),
+        "max_retries": args.max_retries,
+    }
+    # workers start lazily from request threads, and forking a threaded process is unsafe
+    context = multiprocessing.get_context("spawn")
+    limiter = context.BoundedSemaphore(max(1, args.max_concurrent_detections))
+    jobs = JobQueue(workers, max(0, args.queue_size), (api_key, cache_path, limiter, client_options), context)
+    memory_budget = int(args.memory_budget * 1e6) if args.memory_budget else None
+    server = RedactionServer((args.host, args.port), jobs, int(args.max_body_mb * 1e6), args.request_timeout,
+                             args.detection_mode, args.chunk_chars, max_upload=int(args.max_upload_mb * 1e6),
+                             memory_budget=memory_budget)
+    logger.info("listening on http://%s:%d (%d workers, %d queued jobs)", args.host, server.server_address[1],
+                workers, args.queue_size)
+    # stop like on Ctrl-C, so the pool's workers and semaphores are cleaned up
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        jobs.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
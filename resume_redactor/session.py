@@ -0,0 +1,164 @@
+"""Parse-once document session shared by extraction, image discovery and redaction.
+
+A ``RedactionSession`` opens the PDF a single time and lazily caches what the
+pipeline reads from each page. Redaction runs inside :meth:`edit` on a
+separate, lazily loaded copy of the document, so the session's own document
+and caches stay untouched and can be redacted again with other selections.
+
+A session can be opened from bytes, from a memory-mapped buffer (``mmap`` or
+``memoryview``, read in place) or from a file path, which MuPDF reads on
+demand. The last two never copy the whole file into Python memory, which is
+what the large-file mode (see ``large_file.py``) relies on.
+
+PyMuPDF is imported when the first session opens a document, not when this
+module is imported.
+"""
+import hashlib
+import mmap
+import os
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Union
+
+from resume_redactor.matching import PageText
+from resume_redactor.metrics import stage
+
+if TYPE_CHECKING:
+    import fitz
+
+    from resume_redactor.images import ImageInventory, ThumbnailCache
+
+
+Source = Union[bytes, memoryview, mmap.mmap, str, "os.PathLike[str]"]
+
+
+class RedactionSession:
+    def __init__(self, source: Source):
+        if isinstance(source, (str, os.PathLike)):
+            self.path: Optional[str] = os.fspath(source)
+            self.pdf_bytes: Optional[Union[bytes, memoryview]] = None
+            self.size = os.path.getsize(self.path)
+        else:
+            self.path = None
+            self.pdf_bytes = memoryview(source) if isinstance(source, mmap.mmap) else source
+            self.size = len(self.pdf_bytes)
+        with stage("parse", bytes_in=self.size) as event:
+            self.doc = self._open()
+            event["pages"] = len(self.doc)
+        self._text: Dict[int, str] = {}
+        self._words: Dict[int, PageText] = {}
+        self._images: Optional["ImageInventory"] = None
+        self._thumbnails: Optional["ThumbnailCache"] = None
+        self._digest: Optional[str] = None
+
+    @classmethod
+    @contextmanager
+    def use(cls, pdf: Union[Source, "RedactionSession"]) -> Iterator["RedactionSession"]:
+        """Yield ``pdf`` if it is already a session, otherwise a temporary one."""
+        if isinstance(pdf, RedactionSession):
+            yield pdf
+            return
+        session = cls(pdf)
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def __enter__(self) -> "RedactionSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self.doc.is_closed:
+            self.doc.close()
+
+    def _open(self) -> "fitz.Document":
+        import fitz
+
+        if self.path is not None:
+            return fitz.open(self.path, filetype="pdf")
+        return fitz.open(stream=self.pdf_bytes, filetype="pdf")
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """The path, or the bytes, to open the document again elsewhere (e.g. in a worker process)."""
+        if self.path is not None:
+            return self.path
+        return self.pdf_bytes if isinstance(self.pdf_bytes, bytes) else bytes(self.pdf_bytes)
+
+    def read(self) -> bytes:
+        """The original file contents."""
+        if self.path is None:
+            return bytes(self.pdf_bytes)
+        with open(self.path, "rb") as fh:
+            return fh.read()
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the file contents, computed on first use."""
+        if self._digest is None:
+            digest = hashlib.sha256()
+            if self.path is None:
+                digest.update(self.pdf_bytes)
+            else:
+                with open(self.path, "rb") as fh:
+                    for block in iter(lambda: fh.read(1 << 20), b""):
+                        digest.update(block)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    @property
+    def page_count(self) -> int:
+        return len(self.doc)
+
+    def page_text(self, page_num: int) -> str:
+        if page_num not in self._text:
+            self._text[page_num] = self.doc[page_num].get_text()
+        return self._text[page_num]
+
+    def page_texts(self) -> List[str]:
+        return [self.page_text(i) for i in range(self.page_count)]
+
+    def text(self) -> str:
+        return "\n".join(self.page_texts())
+
+    def page_words(self, page_num: int) -> PageText:
+        if page_num not in self._words:
+            self._words[page_num] = PageText.from_page(self.doc[page_num])
+        return self._words[page_num]
+
+    def release(self, page_numbers: Iterable[int]) -> None:
+        """Drop the cached words of ``page_numbers``; they are rebuilt if needed again."""
+        for page_num in page_numbers:
+            self._words.pop(page_num, None)
+
+    @property
+    def images(self) -> "ImageInventory":
+        if self._images is None:
+            from resume_redactor.images import ImageInventory
+
+            self._images = ImageInventory(self.doc)
+        return self._images
+
+    def thumbnail(self, xref: int) -> Optional[bytes]:
+        """PNG preview of an image, decoded on first request and kept in an LRU."""
+        if self._thumbnails is None:
+            from resume_redactor.images import ThumbnailCache
+
+            self._thumbnails = ThumbnailCache(self.doc)
+        return self._thumbnails.get(xref)
+
+    @contextmanager
+    def edit(self) -> Iterator["fitz.Document"]:
+        """Yield a fresh copy of the document to modify; it is closed on exit.
+
+        Opening the copy only reads the xref table, pages load on demand. This
+        is cheaper than journalling edits on the session's own document, whose
+        undo records make each edit slower the more edits precede it.
+        """
+        doc = self._open()
+        try:
+            yield doc
+        finally:
+            doc.close()
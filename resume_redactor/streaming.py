@@ -0,0 +1,149 @@
+"""Reading streamed completions and the JSON inside them as it arrives.
+
+With ``"stream": true`` the completions endpoint answers with server-sent
+events, one ``data:`` line per content delta, ending with ``data: [DONE]``.
+The JSON object the model writes is only complete at the end, but its
+first fields (names and emails come first in the schema) close within the
+first second. :class:`IncrementalJSONParser` is fed the deltas and hands
+back each value as soon as its closing quote or bracket arrives, so callers
+can show detected fields while the rest is still being generated.
+
+The parser only tracks enough structure to find where values start and
+end (nesting, object keys, strings and escapes); every completed value is
+decoded with ``json.loads``, so what it yields is exactly what parsing the
+whole document would give.
+"""
+import json
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+# called with (section, field, values) whenever a field closes in the stream
+FieldCallback = Callable[[str, str, List[str]], None]
+
+
+class _Container:
+    __slots__ = ("kind", "start", "key", "expect_key")
+
+    def __init__(self, kind: str, start: int):
+        self.kind = kind
+        self.start = start
+        self.key: Optional[str] = None
+        self.expect_key = kind == "{"
+
+
+class IncrementalJSONParser:
+    """Feed a JSON document in pieces; get back each object member as soon as its value is complete.
+
+    :meth:`feed` returns ``(path, value)`` pairs, where ``path`` is the tuple
+    of object keys leading to the value, for members at most ``max_depth``
+    keys deep. Array elements are not reported on their own; the array is,
+    once it closes.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self.buffer = ""
+        self._pos = 0
+        self._stack: List[_Container] = []
+        self._string_start: Optional[int] = None
+        self._escape = False
+        self._scalar_start: Optional[int] = None
+
+    def _path(self) -> Tuple[str, ...]:
+        return tuple(c.key for c in self._stack if c.kind == "{")
+
+    def _member(self, start: int, end: int, found: List[Tuple[Tuple[str, ...], Any]]) -> None:
+        # a value [start, end) just closed inside the container on top of the stack
+        if not self._stack or self._stack[-1].kind != "{":
+            return
+        path = self._path()
+        if len(path) <= self.max_depth:
+            found.append((path, json.loads(self.buffer[start:end])))
+
+    def _end_scalar(self, end: int, found: List[Tuple[Tuple[str, ...], Any]]) -> None:
+        start, self._scalar_start = self._scalar_start, None
+        self._member(start, end, found)
+
+    def feed(self, chunk: str) -> List[Tuple[Tuple[str, ...], Any]]:
+        self.buffer += chunk
+        found = []
+        buffer = self.buffer
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            if self._string_start is not None:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    start, self._string_start = self._string_start, None
+                    top = self._stack[-1] if self._stack else None
+                    if top is not None and top.kind == "{" and top.expect_key:
+                        top.key = json.loads(buffer[start:pos + 1])
+                    else:
+                        self._member(start, pos + 1, found)
+                continue
+            if self._scalar_start is not None and char in ",}] \t\r\n":
+                self._end_scalar(pos, found)
+            if char == '"':
+                self._string_start = pos
+            elif char in "{[":
+                self._stack.append(_Container(char, pos))
+            elif char in "}]":
+                container = self._stack.pop()
+                self._member(container.start, pos + 1, found)
+            elif char == ":":
+                self._stack[-1].expect_key = False
+            elif char == ",":
+                if self._stack[-1].kind == "{":
+                    self._stack[-1].expect_key = True
+                    self._stack[-1].key = None
+            elif not char.isspace() and self._scalar_start is None:
+                self._scalar_start = pos
+        self._pos = len(buffer)
+        return found
+
+
+def iter_sse(response: "requests.Response") -> Iterator[Dict[str, Any]]:
+    """Yield the JSON payload of each ``data:`` event until ``[DONE]``."""
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        yield json.loads(data)
+
+
+def read_completion(response: "requests.Response", on_value: Callable[[Tuple[str, ...], Any], None],
+                    max_depth: int = 2) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Consume a streamed completion; return its content and usage, reporting values as they close."""
+    parser = IncrementalJSONParser(max_depth)
+    parts = []
+    usage = None
+    try:
+        for event in iter_sse(response):
+            if event.get("usage"):
+                usage = event["usage"]
+            for choice in event.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content")
+                if not delta:
+                    continue
+                parts.append(delta)
+                if parser is None:
+                    continue
+                try:
+                    values = parser.feed(delta)
+                except (ValueError, IndexError):
+                    # not plain JSON: keep reading, the caller parses the whole content at the end
+                    parser = None
+                    continue
+                for path, value in values:
+                    on_value(path, value)
+    finally:
+        response.close()
+    return "".join(parts), usage